@@ -3,4 +3,4 @@ import collections.abc
 
 
 class ImageSeriesABC(collections.abc.Sequence):
-    pass
+    __slots__ = ()
@@ -14,6 +14,8 @@ class _RegisterAdapterClass(abc.ABCMeta):
 
 class ImageSeriesAdapter(ImageSeriesABC, metaclass=_RegisterAdapterClass):
 
+    __slots__ = ()
+
     format = None
 
 # import all adapter modules
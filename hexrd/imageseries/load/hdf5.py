@@ -1,7 +1,17 @@
 """HDF5 adapter class
 """
-import h5py
+from collections import OrderedDict
+import contextlib
+import sys
 import warnings
+import weakref
+
+import h5py
+try:
+    # h5py's global lock is private, so do without it if it moves
+    from h5py._hl.base import phil
+except ImportError:
+    phil = contextlib.nullcontext()
 
 import numpy as np
 
@@ -16,44 +26,113 @@ class HDF5ImageSeriesAdapter(ImageSeriesAdapter):
     ----------
     fname : str or h5py.File object
         filename of the HDF5 file, or an open h5py file.  Note that this
-        class will close the h5py.File when finished.
+        class will close the h5py.File when finished.  Files given by name
+        are opened read-only; see `swmr` and `locking`.
     path : str, required
         The path to the HDF dataset containing the image data
     dataname : str, optional
         The name of the HDF dataset containing the 2-d or 3d image data.
         The default values is 'images'.
+    dtype : str or numpy.dtype, optional
+        If given, frames are converted to this type as they are read, using
+        the HDF5 library's type conversion.  The default is to return the
+        data in its stored type.
+    swmr : bool, optional
+        Open files given by name in SWMR read mode.  The default is False.
+    locking : bool, optional
+        The HDF5 file locking flag for files given by name (needs h5py >=
+        3.5).  By default, the HDF5 library setting is used.
+    cache_nbytes : int, optional
+        Memory budget in bytes for caching image data; the default is
+        128 MiB.  It sizes the HDF5 chunk cache of files given by name.
+        When chunks span several frames, decoded blocks of frames are
+        cached instead, within the same budget, and the HDF5 chunk cache
+        of the image dataset is turned off so chunks are not held twice.
+
+    Notes
+    -----
+    HDF5 cannot reopen a file that is already open in the same process with
+    different SWMR or locking flags, so only set these if the file is not
+    opened elsewhere in the process.
     """
 
     format = 'hdf5'
 
+    __slots__ = (
+        '_HDF5ImageSeriesAdapter__h5name',
+        '_HDF5ImageSeriesAdapter__open_kwargs',
+        '_cache_nbytes',
+        '_HDF5ImageSeriesAdapter__h5file',
+        '_HDF5ImageSeriesAdapter__path',
+        '_HDF5ImageSeriesAdapter__dataname',
+        '_HDF5ImageSeriesAdapter__images',
+        '_HDF5ImageSeriesAdapter__image_dataset',
+        '_HDF5ImageSeriesAdapter__data_group',
+        '_meta',
+        '_ndim',
+        '_block_nframes',
+        '_block_cache',
+        '_max_blocks',
+        '_mmap',
+        '_out_dtype',
+        '_finalizer',
+        '__weakref__',
+    )
+
+    # memory budget for either the HDF5 chunk cache or the block cache
+    _default_cache_nbytes = 128 * 1024 * 1024
+    _rdcc_nslots = 10007
+
+    # decoded frame blocks (one per frame-axis chunk) kept for reuse
+    _max_cached_blocks = 4
+
     def __init__(self, fname, **kwargs):
+        self.__open_kwargs = {}
+        if kwargs.pop('swmr', False):
+            self.__open_kwargs['swmr'] = True
+        locking = kwargs.pop('locking', None)
+        if locking is not None:
+            self.__open_kwargs['locking'] = locking
+        self._cache_nbytes = int(
+            kwargs.pop('cache_nbytes', self._default_cache_nbytes)
+        )
+
         if isinstance(fname, h5py.File):
             self.__h5name = fname.filename
             self.__h5file = fname
         else:
             self.__h5name = fname
-            self.__h5file = h5py.File(self.__h5name, 'r')
+            self.__h5file = self._open_file()
+        self._register_finalizer()
 
         self.__path = kwargs['path']
         self.__dataname = kwargs.pop('dataname', 'images')
         self.__images = '/'.join([self.__path, self.__dataname])
+        dtype = kwargs.pop('dtype', None)
+        self._out_dtype = None if dtype is None else np.dtype(dtype)
         self._load_data()
         self._meta = self._getmeta()
 
     def close(self):
+        self._block_cache.clear()
+        self._mmap = None
         self.__image_dataset = None
         self.__data_group = None
-        self.__h5file.close()
+        self._finalizer()
         self.__h5file = None
 
-    def __del__(self):
-        # !!! Note this is not ideal, as the use of __del__ is problematic.
-        #     However, it is highly unlikely that the usage of a ImageSeries
-        #     would pose a problem.  A warning will (hopefully) be emitted if
-        #     an issue arises at some point
+    def _register_finalizer(self):
+        # Unlike __del__, a finalizer also runs when the adapter is part of
+        # a reference cycle, so the file is not left open.
+        self._finalizer = weakref.finalize(
+            self, self._close_file, self.__h5file
+        )
+
+    @staticmethod
+    def _close_file(h5file):
         try:
-            self.close()
-        except(Exception):
+            h5file.close()
+        except Exception:
             warnings.warn("HDF5ImageSeries could not close h5 file")
 
     def __getitem__(self, key):
@@ -63,13 +142,105 @@ class HDF5ImageSeriesAdapter(ImageSeriesAdapter):
                     f'key {key} is out of range for imageseris with length 1'
                 )
             # !!! necessary when not returning a slice
-            return np.asarray(self.__image_dataset)
-        else:
-            return self.__image_dataset[key]
+            key = ()
+        elif self._block_nframes and isinstance(key, (int, np.integer)):
+            return self._get_cached_frame(key)
+
+        return self._read(key)
 
     def __iter__(self):
         return ImageSeriesIterator(self)
 
+    def iterframes(self, out=None):
+        """Iterate over the frames, reading each directly from the file
+
+        Frames are read with `h5py.Dataset.read_direct`, which skips the
+        intermediate array that slicing the dataset would create.
+
+        Parameters
+        ----------
+        out : numpy.ndarray, optional
+            A preallocated array with the frame shape to read into.  If
+            given, `out` itself is yielded for every frame and is
+            overwritten on the next step, so copy any frame that needs to
+            be kept.  By default a new array is allocated for each frame.
+
+        Yields
+        ------
+        numpy.ndarray
+            The next frame.
+        """
+        ds = self.__image_dataset
+        for i in range(len(self)):
+            buf = out
+            if buf is None:
+                buf = np.empty(self.shape, dtype=self.dtype)
+            if self._mmap is not None:
+                buf[...] = self._mmap if self._ndim == 2 else self._mmap[i]
+            elif self._ndim == 2:
+                ds.read_direct(buf)
+            else:
+                ds.read_direct(buf, np.s_[i])
+            yield buf
+
+    def read_batch(self, indices):
+        """Read several frames at once
+
+        The requested frames are sorted and each run of consecutive frames
+        is read with a single slice, so chunks shared by neighbouring
+        frames are only read and decompressed once.
+
+        Parameters
+        ----------
+        indices : array_like
+            The (n, ) frame indices to read, in any order.  Negative and
+            repeated indices are allowed.
+
+        Raises
+        ------
+        TypeError
+            If the indices are not integers.
+        IndexError
+            If any index is out of range.
+
+        Returns
+        -------
+        numpy.ndarray
+            The (n, rows, cols) array of frames, in the order requested.
+        """
+        nframes = len(self)
+        idx = np.atleast_1d(np.asarray(indices))
+        if idx.size == 0:
+            idx = idx.astype(int)
+        elif idx.dtype.kind not in 'iu':
+            raise TypeError(
+                f'frame indices must be integers, not {idx.dtype}'
+            )
+        idx = np.where(idx < 0, idx + nframes, idx)
+        if np.any((idx < 0) | (idx >= nframes)):
+            raise IndexError(
+                f'indices out of range for imageseries with length {nframes}'
+            )
+
+        if idx.size == 0:
+            return np.empty((0,) + self.shape, dtype=self.dtype)
+        elif self._ndim == 2:
+            return np.repeat(self[0][np.newaxis], idx.size, axis=0)
+        elif self._mmap is not None:
+            # fancy indexing already copies out of the mapping
+            return np.asarray(self._mmap[idx], dtype=self.dtype)
+
+        # group the unique frames into runs of consecutive indices
+        uniq, inverse = np.unique(idx, return_inverse=True)
+        breaks = np.flatnonzero(np.diff(uniq) != 1) + 1
+        starts = uniq[np.r_[0, breaks]]
+        stops = uniq[np.r_[breaks - 1, -1]] + 1
+
+        data = np.concatenate(
+            [self._read(np.s_[i:j]) for i, j in zip(starts, stops)]
+        )
+        return data[inverse]
+
     def __len__(self):
         if self._ndim == 2:
             return 1
@@ -86,23 +257,39 @@ class HDF5ImageSeriesAdapter(ImageSeriesAdapter):
         ]
 
         # Prefix them with the private prefix
-        prefix = f'_{self.__class__.__name__}'
+        prefix = '_HDF5ImageSeriesAdapter'
         to_remove = [f'{prefix}{x}' for x in to_remove]
 
-        # Make a copy of the dict to modify
-        state = self.__dict__.copy()
-
-        # Remove them
-        for attr in to_remove:
-            state.pop(attr)
+        # The decoded blocks, file mapping and finalizer are rebuilt on load
+        to_remove += ['_block_cache', '_mmap', '_finalizer', '__weakref__']
 
-        return state
+        return {
+            attr: getattr(self, attr) for attr in self.__slots__
+            if attr not in to_remove and hasattr(self, attr)
+        }
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
-        self.__h5file = h5py.File(self.__h5name, 'r')
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        self.__h5file = self._open_file()
+        self._register_finalizer()
         self._load_data()
 
+    def _open_file(self):
+        kwargs = {
+            'rdcc_nbytes': self._cache_nbytes,
+            'rdcc_nslots': self._rdcc_nslots,
+            **self.__open_kwargs,
+        }
+        try:
+            return h5py.File(self.__h5name, 'r', **kwargs)
+        except TypeError:
+            if 'locking' not in kwargs:
+                raise
+            # h5py < 3.5 does not support the `locking` argument
+            kwargs.pop('locking')
+            return h5py.File(self.__h5name, 'r', **kwargs)
+
     def _load_data(self):
         self.__image_dataset = self.__h5file[self.__images]
         self._ndim = self.__image_dataset.ndim
@@ -112,12 +299,98 @@ class HDF5ImageSeriesAdapter(ImageSeriesAdapter):
             )
         self.__data_group = self.__h5file[self.__path]
 
-    def _getmeta(self):
-        mdict = {}
-        for k, v in list(self.__data_group.attrs.items()):
-            mdict[k] = v
+        # When chunks span several frames, single-frame reads would decode
+        # the same chunk repeatedly; read whole chunk-aligned blocks instead
+        # and keep the most recent ones around.
+        self._block_nframes = None
+        self._block_cache = OrderedDict()
+        chunks = self.__image_dataset.chunks
+        if self._ndim == 3 and chunks is not None and chunks[0] > 1:
+            frame_nbytes = np.prod(self.shape) * self.dtype.itemsize
+            block_nbytes = chunks[0] * frame_nbytes
+            if block_nbytes <= self._cache_nbytes:
+                self._block_nframes = chunks[0]
+                self._max_blocks = int(min(
+                    self._max_cached_blocks,
+                    self._cache_nbytes // block_nbytes
+                ))
+                # each chunk is decoded once per block read, so the HDF5
+                # chunk cache would only duplicate the cached blocks; HDF5
+                # shares open datasets, so close ours before reopening
+                self.__image_dataset = None
+                self.__image_dataset = self._open_uncached_dataset()
+
+        # Contiguous, unfiltered data can be mapped straight from the file,
+        # bypassing the HDF5 read machinery entirely.
+        self._mmap = None
+        if self._can_memmap(self.__image_dataset):
+            ds = self.__image_dataset
+            self._mmap = np.memmap(
+                self.__h5name, mode='r', dtype=ds.dtype, shape=ds.shape,
+                offset=ds.id.get_offset()
+            )
 
-        return mdict
+    def _open_uncached_dataset(self):
+        dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+        dapl.set_chunk_cache(self._rdcc_nslots, 0, 0.75)
+        dsid = h5py.h5d.open(
+            self.__h5file.id, self.__images.encode(), dapl=dapl
+        )
+        return h5py.Dataset(dsid)
+
+    @staticmethod
+    def _can_memmap(ds):
+        return (
+            not sys.platform.startswith('win')
+            and ds.file.driver == 'sec2'
+            and ds.file.mode == 'r'
+            and ds.chunks is None
+            and ds.compression is None
+            and ds.dtype.kind in 'biuf'
+            and ds.size > 0
+            and ds.id.get_offset() is not None
+        )
+
+    def _get_cached_frame(self, key):
+        nframes = len(self.__image_dataset)
+        if key < 0:
+            key += nframes
+        if not 0 <= key < nframes:
+            raise IndexError(
+                f'key {key} is out of range for imageseries with length '
+                f'{nframes}'
+            )
+
+        block, offset = divmod(int(key), self._block_nframes)
+        try:
+            data = self._block_cache[block]
+            self._block_cache.move_to_end(block)
+        except KeyError:
+            start = block * self._block_nframes
+            data = self._read(np.s_[start:start + self._block_nframes])
+            self._block_cache[block] = data
+            if len(self._block_cache) > self._max_blocks:
+                self._block_cache.popitem(last=False)
+
+        # copy so callers cannot modify the cached block
+        return data[offset].copy()
+
+    def _read(self, key):
+        """Read `key` from the image data in the output dtype"""
+        if self._mmap is not None:
+            # copy out of the read-only mapping
+            return np.array(self._mmap[key], dtype=self.dtype)
+
+        ds = self.__image_dataset
+        if self._out_dtype is not None:
+            ds = ds.astype(self._out_dtype)
+        return ds[key]
+
+    def _getmeta(self):
+        # hold h5py's global lock once for all of the attribute reads
+        # rather than taking it again for every attribute
+        with phil:
+            return dict(self.__data_group.attrs)
 
     @property
     def metadata(self):
@@ -129,6 +402,8 @@ class HDF5ImageSeriesAdapter(ImageSeriesAdapter):
 
     @property
     def dtype(self):
+        if self._out_dtype is not None:
+            return self._out_dtype
         return self.__image_dataset.dtype
 
     @property
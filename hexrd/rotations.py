@@ -28,19 +28,19 @@
 #
 # Module containing functions relevant to rotations
 #
+import math
 import sys
 
 import numpy as np
-from numba import njit
-from scipy.optimize import leastsq
+from numba import njit, vectorize
 from scipy.spatial.transform import Rotation as R
 
 from hexrd.deprecation import deprecated
 from hexrd import constants as cnst
+from hexrd.utils.decorators import memoize
 from hexrd.matrixutil import (
     columnNorm,
     unitVector,
-    findDuplicateVectors,
     multMatArray,
     nullSpace,
 )
@@ -53,8 +53,23 @@ angularUnits = 'radians'  # module-level angle units
 periodDict = {'degrees': 360.0, 'radians': 2 * np.pi}
 conversion_to_dict = {'degrees': cnst.r2d, 'radians': cnst.d2r}
 
+# The numba kernels in this module are serial.  They mostly see one or a few
+# orientations per call, and the heavy callers (findorientations, fit-grains)
+# already run them in process pools, where numba threads would only
+# oversubscribe the workers.
+
+# plain float versions of the above for use in hot paths
+_TWO_PI = 2 * np.pi
+_D2R = float(cnst.d2r)
+_TEN_EPSF = float(cnst.ten_epsf)
+_FLOAT_MAX = float(np.finfo(float).max)
+
 I3 = cnst.identity_3x3  # (3, 3) identity matrix
 
+# (4, 1) identity quaternion; read-only, so copy before handing it out
+_IDENTITY_QUAT = np.array([[1.0], [0.0], [0.0], [0.0]])
+_IDENTITY_QUAT.flags.writeable = False
+
 # axes orders, all permutations
 axes_orders = [
     'xyz',
@@ -70,12 +85,13 @@ axes_orders = [
     'zxz',
     'zyz',
 ]
+_axes_orders_set = frozenset(axes_orders)
 
-sq3by2 = np.sqrt(3.0) / 2.0
-piby2 = np.pi / 2.0
-piby3 = np.pi / 3.0
-piby4 = np.pi / 4.0
-piby6 = np.pi / 6.0
+sq3by2 = math.sqrt(3.0) / 2.0
+piby2 = math.pi / 2.0
+piby3 = math.pi / 3.0
+piby4 = math.pi / 4.0
+piby6 = math.pi / 6.0
 
 # =============================================================================
 # Functions
@@ -88,10 +104,23 @@ def arccosSafe(cosines):
     due to round-off
     """
     cosines = np.atleast_1d(cosines)
-    if (np.abs(cosines) > 1.00001).any():
-        print("attempt to take arccos of %s" % cosines, file=sys.stderr)
-        raise RuntimeError("unrecoverable error")
-    return np.arccos(np.clip(cosines, -1.0, 1.0))
+    if cosines.size:
+        lo, hi = cosines.min(), cosines.max()
+        if math.isnan(hi):
+            # NaN propagates through min and max and would hide any
+            # out-of-range values, so check elementwise; the NaNs
+            # themselves pass through to arccos
+            out_of_range = (np.abs(cosines) > 1.00001).any()
+        else:
+            out_of_range = hi > 1.00001 or lo < -1.00001
+        if out_of_range:
+            print("attempt to take arccos of %s" % cosines, file=sys.stderr)
+            raise RuntimeError("unrecoverable error")
+    clipped = np.clip(cosines, -1.0, 1.0)
+    if clipped.dtype.kind == 'f':
+        # the clipped copy is ours, so take the arccos in place
+        return np.arccos(clipped, out=clipped)
+    return np.arccos(clipped)
 
 #
 #  ==================== Quaternions
@@ -103,16 +132,70 @@ def _quat_to_scipy_rotation(q: np.ndarray) -> R:
     Scipy has quaternions in a differnt order, this method converts them
     q must be a 2d array of shape (4, n).
     """
-    return R.from_quat(np.roll(q.T, -1, axis=1))
+    return R.from_quat(q[[1, 2, 3, 0]].T)
 
 
 def _scipy_rotation_to_quat(r: R) -> np.ndarray:
-    quat = np.roll(np.atleast_2d(r.as_quat()), 1, axis=1).T
+    quat = np.atleast_2d(r.as_quat())[:, [3, 0, 1, 2]].T
     # Fix quat would work, but it does too much.  Only need to check positive
-    quat *= np.sign(quat[0, :])
+    quat *= np.where(quat[0] < 0, -1.0, 1.0)
     return quat
 
 
+def _hamilton_product(p, q):
+    """
+    Hamilton product p * q of quaternion arrays.
+
+    p and q have shape (4, ...) with the scalar part first; the trailing
+    dimensions are broadcast against each other.
+    """
+    p0, p1, p2, p3 = p
+    q0, q1, q2, q3 = q
+    return np.array([
+        p0 * q0 - p1 * q1 - p2 * q2 - p3 * q3,
+        p0 * q1 + p1 * q0 + p2 * q3 - p3 * q2,
+        p0 * q2 - p1 * q3 + p2 * q0 + p3 * q1,
+        p0 * q3 + p1 * q2 - p2 * q1 + p3 * q0,
+    ])
+
+
+@njit(cache=True, nogil=True, inline='always')
+def _quat_mult(p0, p1, p2, p3, q0, q1, q2, q3):
+    """Hamilton product p * q of two quaternions given by components"""
+    return (
+        p0 * q0 - p1 * q1 - p2 * q2 - p3 * q3,
+        p0 * q1 + p1 * q0 + p2 * q3 - p3 * q2,
+        p0 * q2 - p1 * q3 + p2 * q0 + p3 * q1,
+        p0 * q3 + p1 * q2 - p2 * q1 + p3 * q0,
+    )
+
+
+@njit(cache=True, nogil=True, inline='always')
+def _fix_quat_components(q0, q1, q2, q3):
+    """Normalize a quaternion and flip it to a nonnegative scalar part"""
+    nrm = np.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+    # prevent divide by zero, as in unitVector
+    if nrm <= _TEN_EPSF:
+        nrm = 1.0
+    if q0 < 0:
+        nrm = -nrm
+    return q0 / nrm, q1 / nrm, q2 / nrm, q3 / nrm
+
+
+@njit(cache=True, nogil=True)
+def _fixquat(q, conjugate=False):
+    n = q.shape[1]
+    qfix = np.empty((4, n))
+    for i in range(n):
+        q0 = -q[0, i] if conjugate else q[0, i]
+        w, x, y, z = _fix_quat_components(q0, q[1, i], q[2, i], q[3, i])
+        qfix[0, i] = w
+        qfix[1, i] = x
+        qfix[2, i] = y
+        qfix[3, i] = z
+    return qfix
+
+
 def fixQuat(q):
     """
     flip to positive q0 and normalize
@@ -122,14 +205,15 @@ def fixQuat(q):
         l, m, n = q.shape
         assert m == 4, 'your 3-d quaternion array isn\'t the right shape'
         q = q.transpose(0, 2, 1).reshape(l * n, 4).T
+    elif qdims == 1:
+        q = q.reshape(4, 1)
 
-    qfix = unitVector(q)
-
-    q0negative = qfix[0, ] < 0
-    qfix[:, q0negative] = -1 * qfix[:, q0negative]
+    qfix = _fixquat(q)
 
     if qdims == 3:
-        qfix = qfix.T.reshape(l, n, 4).transpose(0, 2, 1)
+        qfix = qfix.reshape(4, l, n).transpose(1, 0, 2)
+    elif qdims == 1:
+        qfix = qfix.reshape(4)
 
     return qfix
 
@@ -138,13 +222,14 @@ def invertQuat(q):
     """
     silly little routine for inverting a quaternion
     """
-    numq = q.shape[1]
-
-    imat = np.tile(np.vstack([-1, 1, 1, 1]), (1, numq))
+    # negate the scalar part and fix the result in one pass
+    if q.ndim == 1:
+        return _fixquat(q.reshape(4, 1), True).reshape(4)
+    return _fixquat(q, True)
 
-    qinv = imat * q
 
-    return fixQuat(qinv)
+def _is_identity_quat(q):
+    return q is not None and q.shape == (4, 1) and (q == _IDENTITY_QUAT).all()
 
 
 def misorientation(q1, q2, symmetries=None):
@@ -182,17 +267,15 @@ def misorientation(q1, q2, symmetries=None):
             % (q1.shape,)
         )
 
-    if symmetries is None:
-        # no symmetries; use identity
-        symmetries = (np.c_[1.0, 0, 0, 0].T, np.c_[1.0, 0, 0, 0].T)
-    else:
+    # crystal (right) and sample (left) symmetries; None for triclinic
+    csym = ssym = None
+    if symmetries is not None:
         # check symmetry argument
         if len(symmetries) == 1:
             if not isinstance(symmetries[0], np.ndarray):
                 raise RuntimeError("symmetry argument is not an numpy array")
             else:
-                # add triclinic sample symmetry (identity)
-                symmetries += (np.c_[1.0, 0, 0, 0].T,)
+                csym = symmetries[0]
         elif len(symmetries) == 2:
             if not isinstance(symmetries[0], np.ndarray) or not isinstance(
                 symmetries[1], np.ndarray
@@ -200,57 +283,88 @@ def misorientation(q1, q2, symmetries=None):
                 raise RuntimeError(
                     "symmetry arguments are not an numpy arrays"
                 )
+            csym, ssym = symmetries
         elif len(symmetries) > 2:
             raise RuntimeError(
                 "symmetry argument has %d entries; should be 1 or 2"
                 % (len(symmetries))
             )
 
-    # set some lengths
-    n = q2.shape[1]  # length of misorientation list
-    m = symmetries[0].shape[1]  # crystal (right)
-    p = symmetries[1].shape[1]  # sample  (left)
-
-    # tile q1 inverse
-    q1i = quatProductMatrix(invertQuat(q1), mult='right').squeeze()
+        # a group holding only the identity is the same as none at all
+        if _is_identity_quat(csym):
+            csym = None
+        if _is_identity_quat(ssym):
+            ssym = None
 
-    # convert symmetries to (4, 4) qprod matrices
-    rsym = quatProductMatrix(symmetries[0], mult='right')
-    lsym = quatProductMatrix(symmetries[1], mult='left')
+    q1i = invertQuat(q1)[:, 0]
+    if csym is None and ssym is None:
+        # no symmetries; there is just the one equivalent
+        mis = fixQuat(_hamilton_product(q2, q1i))
+        return 2 * arccosSafe(mis[0, :]), mis
 
-    # Do R * Gc, store as
-    # [q2[:, 0] * Gc[:, 0:m], ..., q2[:, n-1] * Gc[:, 0:m]]
-    q2 = np.dot(rsym, q2).transpose(2, 0, 1).reshape(m * n, 4).T
+    # find the misorientation closest to the origin among the symmetric
+    # equivalents of each quaternion in q2
+    qeqv = _symmetric_equivalents(q2, csym, ssym)
+    mis = np.empty((4, q2.shape[1]))
+    qmax = _min_misorientation(qeqv, q1i, mis)
 
-    # Do Gs * (R * Gc), store as
-    # [Gs[:, 0:p]*q[:,   0]*Gc[:, 0], ..., Gs[:, 0:p]*q[:,   0]*Gc[:, m-1], ...
-    #  Gs[:, 0:p]*q[:, n-1]*Gc[:, 0], ..., Gs[:, 0:p]*q[:, n-1]*Gc[:, m-1]]
-    q2 = np.dot(lsym, q2).transpose(2, 0, 1).reshape(p * m * n, 4).T
+    angle = 2 * arccosSafe(qmax)
 
-    # Calculate the class misorientations for full symmetrically equivalent
-    # classes for q1 and q2.  Note the use of the fact that the application
-    # of the symmetry groups is an isometry.
-    eqvMis = fixQuat(np.dot(q1i, q2))
+    return angle, mis
 
-    # Reshape scalar comp columnwise by point in q2 (and q1, if applicable)
-    sclEqvMis = eqvMis[0, :].reshape(n, p * m).T
 
-    # Find misorientation closest to origin for each n equivalence classes
-    #   - fixed quats so garaunteed that sclEqvMis is nonnegative
-    qmax = sclEqvMis.max(0)
+def _symmetric_equivalents(q, csym, ssym):
+    """
+    Apply crystal (right) and sample (left) symmetries to quaternions.
 
-    # remap indices to use in eqvMis
-    qmaxInd = (sclEqvMis == qmax).nonzero()
-    qmaxInd = np.c_[qmaxInd[0], qmaxInd[1]]
+    Returns the (4, n, m*p) array of Gs * q * Gc, where n, m and p are the
+    numbers of quaternions and crystal and sample symmetry operators; the
+    sample operators vary fastest along the last axis.  Either symmetry
+    may be None for triclinic.
+    """
+    n = q.shape[1]
+    m = 1 if csym is None else csym.shape[1]
+    p = 1 if ssym is None else ssym.shape[1]
 
-    eqvMisColInd = np.sort(qmaxInd[:, 0] + qmaxInd[:, 1] * p * m)
+    # Note the use of the fact that the application of the symmetry groups
+    # is an isometry.
+    qeqv = q[:, :, np.newaxis, np.newaxis]
+    if csym is not None:
+        qeqv = _hamilton_product(qeqv, csym[:, np.newaxis, :, np.newaxis])
+    if ssym is not None:
+        qeqv = _hamilton_product(ssym[:, np.newaxis, np.newaxis, :], qeqv)
+    return qeqv.reshape(4, n, m * p)
 
-    # store Rmin in q
-    mis = eqvMis[np.ix_(list(range(4)), eqvMisColInd)]
 
-    angle = 2 * arccosSafe(qmax)
+@njit(cache=True, nogil=True)
+def _min_misorientation(qeqv, q1i, mis):
+    """
+    Find the misorientation closest to the origin in each equivalence class
 
-    return angle, mis
+    For each of the n classes of symmetric equivalents in the (4, n, k)
+    array `qeqv`, the products qeqv * q1i are normalized and flipped to a
+    nonnegative scalar part as in `fixQuat`; the one with the largest
+    scalar part (the first, if tied) is written to the (4, n) array `mis`.
+    Returns the (n, ) array of their scalar parts.
+    """
+    n = qeqv.shape[1]
+    qmax = np.empty(n)
+    for j in range(n):
+        best = 0.0
+        for k in range(qeqv.shape[2]):
+            w, x, y, z = _quat_mult(
+                qeqv[0, j, k], qeqv[1, j, k], qeqv[2, j, k], qeqv[3, j, k],
+                q1i[0], q1i[1], q1i[2], q1i[3]
+            )
+            w, x, y, z = _fix_quat_components(w, x, y, z)
+            if k == 0 or w > best:
+                best = w
+                mis[0, j] = w
+                mis[1, j] = x
+                mis[2, j] = y
+                mis[3, j] = z
+        qmax[j] = best
+    return qmax
 
 
 def quatProduct(q1, q2):
@@ -271,10 +385,14 @@ def quatProduct(q1, q2):
 
     R(qp) = R(q2) R(q1)
     """
-    rot_1 = _quat_to_scipy_rotation(q1)
-    rot_2 = _quat_to_scipy_rotation(q2)
-    rot_p = rot_2 * rot_1
-    return _scipy_rotation_to_quat(rot_p)
+    qp = _hamilton_product(q2, q1)
+
+    # normalize, as the inputs are not checked for unit length, and flip
+    # to a nonnegative scalar part by negating the norm where needed
+    nrm = np.sqrt(np.sum(qp * qp, axis=0))
+    nrm *= np.where(qp[0] < 0, -1.0, 1.0)
+    qp /= nrm
+    return qp
 
 
 def quatProductMatrix(quats, mult='right'):
@@ -308,23 +426,44 @@ def quatProductMatrix(quats, mult='right'):
     if quats.shape[0] != 4:
         raise RuntimeError("input is the wrong size along the 0-axis")
 
+    if mult not in ('right', 'left'):
+        raise RuntimeError("mult must be either 'right' or 'left'")
+
+    return _quatproductmatrix(quats, mult == 'right')
+
+
+@njit(cache=True, nogil=True)
+def _quatproductmatrix(quats, right):
     nq = quats.shape[1]
-    q0 = quats[0, :].copy()
-    q1 = quats[1, :].copy()
-    q2 = quats[2, :].copy()
-    q3 = quats[3, :].copy()
-    if mult == 'right':
-        qmats = np.array([[q0], [q1], [q2], [q3],
-                       [-q1], [q0], [-q3], [q2],
-                       [-q2], [q3], [q0], [-q1],
-                       [-q3], [-q2], [q1], [q0]])
-    elif mult == 'left':
-        qmats = np.array([[q0], [q1], [q2], [q3],
-                       [-q1], [q0], [q3], [-q2],
-                       [-q2], [-q3], [q0], [q1],
-                       [-q3], [q2], [-q1], [q0]])
-    # some fancy reshuffling...
-    qmats = qmats.T.reshape((nq, 4, 4)).transpose(0, 2, 1)
+    qmats = np.empty((nq, 4, 4))
+    # the left and right operators differ only in the sign of the
+    # vector cross-terms in the lower right 3 x 3 block
+    s = 1.0 if right else -1.0
+    for i in range(nq):
+        q0 = quats[0, i]
+        q1 = quats[1, i]
+        q2 = quats[2, i]
+        q3 = quats[3, i]
+
+        qmats[i, 0, 0] = q0
+        qmats[i, 0, 1] = -q1
+        qmats[i, 0, 2] = -q2
+        qmats[i, 0, 3] = -q3
+
+        qmats[i, 1, 0] = q1
+        qmats[i, 1, 1] = q0
+        qmats[i, 1, 2] = s * q3
+        qmats[i, 1, 3] = -s * q2
+
+        qmats[i, 2, 0] = q2
+        qmats[i, 2, 1] = -s * q3
+        qmats[i, 2, 2] = q0
+        qmats[i, 2, 3] = s * q1
+
+        qmats[i, 3, 0] = q3
+        qmats[i, 3, 1] = s * q2
+        qmats[i, 3, 2] = -s * q1
+        qmats[i, 3, 3] = q0
     return qmats
 
 
@@ -335,9 +474,8 @@ def quatOfAngleAxis(angle, rotaxis):
     angle = np.atleast_1d(angle)
     n = len(angle)
 
-    if rotaxis.shape[1] == 1:
-        rotaxis = np.tile(rotaxis, (1, n))
-    elif rotaxis.shape[1] != n:
+    # a single axis is broadcast against the angles
+    if rotaxis.shape[1] != 1 and rotaxis.shape[1] != n:
         raise RuntimeError("rotation axes argument has incompatible shape")
 
     # Normalize the axes
@@ -398,36 +536,46 @@ def quatAverageCluster(q_in, qsym):
 
     # check to see num of quats is > 1
     if q_in.shape[1] < 3:
-        if q_in.shape[1] == 1:
-            q_bar = q_in
-        else:
-            ma, mq = misorientation(
-                q_in[:, 0].reshape(4, 1), q_in[:, 1].reshape(4, 1), (qsym,)
-            )
-
-            q_bar = quatProduct(
-                q_in[:, 0].reshape(4, 1),
-                quatOfExpMap(0.5 * ma * unitVector(mq[1:])).reshape(4, 1),
-            )
+        q_bar = _quat_average_pair(q_in, qsym)
     else:
         # first drag to origin using first quat (arb!)
-        q0 = q_in[:, 0].reshape(4, 1)
-        qrot = np.dot(quatProductMatrix(invertQuat(q0), mult='left'), q_in)
+        q0 = q_in[:, :1]
+        qrot = _hamilton_product(invertQuat(q0), q_in)
 
         # second, re-cast to FR
-        qrot = toFundamentalRegion(qrot.squeeze(), crysSym=qsym)
+        qrot = toFundamentalRegion(qrot, crysSym=qsym)
 
         # compute arithmetic average
-        q_bar = unitVector(np.average(qrot, axis=1).reshape(4, 1))
+        q_bar = unitVector(qrot.mean(axis=1, keepdims=True))
 
         # unrotate!
-        q_bar = np.dot(quatProductMatrix(q0, mult='left'), q_bar)
+        q_bar = _hamilton_product(q0, q_bar)
 
         # re-map
         q_bar = toFundamentalRegion(q_bar, crysSym=qsym)
     return q_bar
 
 
+def _quat_average_pair(q_in, qsym):
+    """Average the one or two quaternions in the (4, 1) or (4, 2) q_in"""
+    if q_in.shape[1] == 1:
+        return q_in
+
+    # rotate the first quaternion halfway along the misorientation
+    ma, mq = misorientation(q_in[:, :1], q_in[:, 1:], (qsym,))
+    return quatProduct(
+        q_in[:, :1], _quat_of_rotvec(0.5 * ma[0] * unitVector(mq[1:])[:, 0])
+    )
+
+
+def _quat_of_rotvec(x):
+    """(4, 1) unit quaternion for the (3, ) rotation vector x"""
+    phi = np.sqrt(np.dot(x, x))
+    if phi <= np.finfo(float).eps:
+        return _IDENTITY_QUAT.copy()
+    return np.r_[np.cos(0.5 * phi), np.sin(0.5 * phi) * x / phi].reshape(4, 1)
+
+
 def quatAverage(q_in, qsym):
     """ """
     assert q_in.ndim == 2, 'input must be 2-s hstacked quats'
@@ -437,45 +585,36 @@ def quatAverage(q_in, qsym):
 
     # check to see num of quats is > 1
     if q_in.shape[1] < 3:
-        if q_in.shape[1] == 1:
-            q_bar = q_in
-        else:
-            ma, mq = misorientation(
-                q_in[:, 0].reshape(4, 1), q_in[:, 1].reshape(4, 1), (qsym,)
-            )
-            q_bar = quatProduct(
-                q_in[:, 0].reshape(4, 1),
-                quatOfExpMap(0.5 * ma * unitVector(mq[1:].reshape(3, 1))),
-            )
+        q_bar = _quat_average_pair(q_in, qsym)
     else:
+        # scipy.optimize is slow to import and only needed here
+        from scipy.optimize import leastsq
+
         # use first quat as initial guess
         phi = 2.0 * np.arccos(q_in[0, 0])
         if phi <= np.finfo(float).eps:
             x0 = np.zeros(3)
         else:
-            n = unitVector(q_in[1:, 0].reshape(3, 1))
-            x0 = phi * n.flatten()
-        results = leastsq(quatAverage_obj, x0, args=(q_in, qsym))
-        phi = np.sqrt(sum(results[0] * results[0]))
-        if phi <= np.finfo(float).eps:
-            q_bar = np.c_[1.0, 0.0, 0.0, 0.0].T
-        else:
-            n = results[0] / phi
-            q_bar = np.hstack(
-                [np.cos(0.5 * phi), np.sin(0.5 * phi) * n]
-            ).reshape(4, 1)
+            x0 = phi * unitVector(q_in[1:, :1])[:, 0]
+        # the symmetric equivalents and the workspace for the residual,
+        # which leastsq evaluates many times, do not depend on the estimate
+        qeqv = _symmetric_equivalents(q_in, qsym, None)
+        mis = np.empty_like(q_in)
+        results = leastsq(_quat_average_resd, x0, args=(qeqv, mis))
+        q_bar = _quat_of_rotvec(results[0])
     return q_bar
 
 
 def quatAverage_obj(xi_in, quats, qsym):
-    phi = np.sqrt(sum(xi_in.flatten() * xi_in.flatten()))
-    if phi <= np.finfo(float).eps:
-        q0 = np.c_[1.0, 0.0, 0.0, 0.0].T
-    else:
-        n = xi_in.flatten() / phi
-        q0 = np.hstack([np.cos(0.5 * phi), np.sin(0.5 * phi) * n])
-    resd = misorientation(q0.reshape(4, 1), quats, (qsym,))[0]
-    return resd
+    qeqv = _symmetric_equivalents(quats, qsym, None)
+    return _quat_average_resd(xi_in, qeqv, np.empty_like(quats))
+
+
+def _quat_average_resd(xi_in, qeqv, mis):
+    # the misorientations from q0 of the quats with symmetric equivalents
+    # qeqv, written into the workspace mis
+    q0i = invertQuat(_quat_of_rotvec(xi_in.ravel()))[:, 0]
+    return 2 * arccosSafe(_min_misorientation(qeqv, q0i, mis))
 
 
 def expMapOfQuat(quats):
@@ -533,29 +672,35 @@ def rotMatOfExpMap_opt(expMap):
 @njit(cache=True, nogil=True)
 def _rotmatofquat(quat):
     n = quat.shape[1]
-    # FIXME: maybe preallocate for speed?
-    # R = np.zeros(n*3*3, dtype='float64')
-
-    a = np.ascontiguousarray(quat[0, :]).reshape(n, 1)
-    b = np.ascontiguousarray(quat[1, :]).reshape(n, 1)
-    c = np.ascontiguousarray(quat[2, :]).reshape(n, 1)
-    d = np.ascontiguousarray(quat[3, :]).reshape(n, 1)
-
-    R = np.hstack(
-        (
-            a**2 + b**2 - c**2 - d**2,
-            2 * b * c - 2 * a * d,
-            2 * a * c + 2 * b * d,
-            2 * a * d + 2 * b * c,
-            a**2 - b**2 + c**2 - d**2,
-            2 * c * d - 2 * a * b,
-            2 * b * d - 2 * a * c,
-            2 * a * b + 2 * c * d,
-            a**2 - b**2 - c**2 + d**2,
-        )
-    )
-
-    return R.reshape(n, 3, 3)
+    R = np.empty((n, 3, 3))
+    for i in range(n):
+        a = quat[0, i]
+        b = quat[1, i]
+        c = quat[2, i]
+        d = quat[3, i]
+
+        aa = a * a
+        bb = b * b
+        cc = c * c
+        dd = d * d
+        ab = a * b
+        ac = a * c
+        ad = a * d
+        bc = b * c
+        bd = b * d
+        cd = c * d
+
+        R[i, 0, 0] = aa + bb - cc - dd
+        R[i, 0, 1] = 2.0 * (bc - ad)
+        R[i, 0, 2] = 2.0 * (ac + bd)
+        R[i, 1, 0] = 2.0 * (ad + bc)
+        R[i, 1, 1] = aa - bb + cc - dd
+        R[i, 1, 2] = 2.0 * (cd - ab)
+        R[i, 2, 0] = 2.0 * (bd - ac)
+        R[i, 2, 1] = 2.0 * (ab + cd)
+        R[i, 2, 2] = aa - bb - cc + dd
+
+    return R
 
 
 def rotMatOfQuat(quat):
@@ -639,9 +784,57 @@ def angleAxisOfRotMat(rot_mat):
                 % (rdim)
             )
 
-    rot_vec = R.from_matrix(rot_mat).as_rotvec()
-    angs = np.linalg.norm(rot_vec, axis=1)
-    axes = unitVector(rot_vec.T)
+    return _angleaxisofrotmat(rot_mat)
+
+
+@njit(cache=True, nogil=True)
+def _angleaxisofrotmat(rot_mat):
+    # Each matrix is converted to a quaternion by the method of Markley
+    # (as in scipy's Rotation.from_matrix), which stays accurate near
+    # angles of 0 and pi, and from there to angle and axis.
+    n = len(rot_mat)
+    angs = np.empty(n)
+    axes = np.empty((3, n))
+    for ii in range(n):
+        r = rot_mat[ii]
+        tr = r[0, 0] + r[1, 1] + r[2, 2]
+
+        # the largest of the diagonal and the trace picks the formula
+        # q = [x, y, z, w]
+        q = np.empty(4)
+        i = 0
+        if r[1, 1] > r[i, i]:
+            i = 1
+        if r[2, 2] > r[i, i]:
+            i = 2
+        if tr > r[i, i]:
+            q[0] = r[2, 1] - r[1, 2]
+            q[1] = r[0, 2] - r[2, 0]
+            q[2] = r[1, 0] - r[0, 1]
+            q[3] = 1.0 + tr
+        else:
+            j = (i + 1) % 3
+            k = (j + 1) % 3
+            q[i] = 1.0 - tr + 2.0 * r[i, i]
+            q[j] = r[j, i] + r[i, j]
+            q[k] = r[k, i] + r[i, k]
+            q[3] = r[k, j] - r[j, k]
+        q /= np.sqrt(q[0] ** 2 + q[1] ** 2 + q[2] ** 2 + q[3] ** 2)
+        if q[3] < 0:
+            q = -q
+
+        vnrm = np.sqrt(q[0] ** 2 + q[1] ** 2 + q[2] ** 2)
+        angle = 2.0 * np.arctan2(vnrm, q[3])
+        angs[ii] = angle
+
+        # unit axis; for a null rotation, the (zero) rotation vector
+        # itself, as unitVector leaves it
+        if angle > _TEN_EPSF:
+            for jj in range(3):
+                axes[jj, ii] = q[jj] / vnrm
+        else:
+            for jj in range(3):
+                axes[jj, ii] = 2.0 * q[jj]
     return angs, axes
 
 
@@ -649,7 +842,7 @@ def _check_axes_order(x):
     if not isinstance(x, str):
         raise RuntimeError("argument must be str")
     axo = x.lower()
-    if axo not in axes_orders:
+    if axo not in _axes_orders_set:
         raise RuntimeError("order '%s' is not a valid choice" % x)
     return axo
 
@@ -658,14 +851,28 @@ def _check_is_rmat(x):
     x = np.asarray(x)
     if x.shape != (3, 3):
         raise RuntimeError("shape of input must be (3, 3)")
-    chk1 = np.linalg.det(x)
-    chk2 = np.sum(np.abs(np.eye(3) - np.dot(x, x.T)))
-    if 1.0 - np.abs(chk1) < cnst.sqrt_epsf and chk2 < cnst.sqrt_epsf:
+    if _is_rmat(x.astype(float, copy=False), cnst.sqrt_epsf):
         return x
     else:
         raise RuntimeError("input is not an orthogonal matrix")
 
 
+@njit(cache=True, nogil=True)
+def _is_rmat(x, tol):
+    # closed form determinant and sum(abs(I - x * x^T)) for a 3 x 3
+    det = (
+        x[0, 0] * (x[1, 1] * x[2, 2] - x[1, 2] * x[2, 1])
+        - x[0, 1] * (x[1, 0] * x[2, 2] - x[1, 2] * x[2, 0])
+        + x[0, 2] * (x[1, 0] * x[2, 1] - x[1, 1] * x[2, 0])
+    )
+    orth = 0.0
+    for i in range(3):
+        for j in range(3):
+            xxt = x[i, 0] * x[j, 0] + x[i, 1] * x[j, 1] + x[i, 2] * x[j, 2]
+            orth += abs((1.0 if i == j else 0.0) - xxt)
+    return 1.0 - abs(det) < tol and orth < tol
+
+
 def make_rmat_euler(tilt_angles, axes_order, extrinsic=True):
     """
     Generate rotation matrix from Euler angles.
@@ -793,6 +1000,18 @@ class RotMatEuler(object):
             raise RuntimeError("angular units '%s' not understood" % units)
         self._units = units
 
+        # the scipy euler sequence, and the cached rotation matrix along
+        # with the angles it was computed from
+        self._seq = self._euler_seq()
+        self._rmat = None
+        self._rmat_angles = None
+
+    def _euler_seq(self):
+        # scipy uses upper case axes for intrinsic rotations
+        if self._extrinsic:
+            return self._axes_order
+        return self._axes_order.upper()
+
     @property
     def angles(self):
         return self._angles
@@ -802,6 +1021,7 @@ class RotMatEuler(object):
         x = np.atleast_1d(x).flatten()
         if len(x) == 3:
             self._angles = x
+            self._rmat = None
         else:
             raise RuntimeError("input must be array-like with __len__ = 3")
 
@@ -813,6 +1033,8 @@ class RotMatEuler(object):
     def axes_order(self, x):
         axo = _check_axes_order(x)
         self._axes_order = axo
+        self._seq = self._euler_seq()
+        self._rmat = None
 
     @property
     def extrinsic(self):
@@ -822,6 +1044,8 @@ class RotMatEuler(object):
     def extrinsic(self, x):
         if isinstance(x, bool):
             self._extrinsic = x
+            self._seq = self._euler_seq()
+            self._rmat = None
         else:
             raise RuntimeError("input must be a bool")
 
@@ -836,6 +1060,7 @@ class RotMatEuler(object):
                 # !!! we are changing units; update self.angles
                 self.angles = conversion_to_dict[x] * np.asarray(self.angles)
             self._units = x
+            self._rmat = None
         else:
             raise RuntimeError("input must be 'degrees' or 'radians'")
 
@@ -852,11 +1077,16 @@ class RotMatEuler(object):
             The (3, 3) proper orthogonal matrix according to the specification.
 
         """
-        angs_in = self.angles
-        if self.units == 'degrees':
-            angs_in = conversion_to_dict['radians'] * angs_in
-        self._rmat = make_rmat_euler(angs_in, self.axes_order, self.extrinsic)
-        return self._rmat
+        # The matrix is cached until one of the setters is used; the angles
+        # are compared as well in case they were modified in place.
+        angs = np.asarray(self.angles)
+        if self._rmat is None or not np.array_equal(angs, self._rmat_angles):
+            angs_in = angs
+            if self.units == 'degrees':
+                angs_in = _D2R * angs_in
+            self._rmat = R.from_euler(self._seq, angs_in).as_matrix()
+            self._rmat_angles = angs.copy()
+        return self._rmat.copy()
 
     @rmat.setter
     def rmat(self, x):
@@ -873,14 +1103,11 @@ class RotMatEuler(object):
         None
         """
         rmat = _check_is_rmat(x)
-        self._rmat = rmat
 
-        axo = self.axes_order
-        if not self.extrinsic:
-            axo = axo.upper()
         self._angles = R.from_matrix(rmat).as_euler(
-            axo, self.units == 'degrees'
+            self._seq, self.units == 'degrees'
         )
+        self._rmat = None
 
     @property
     def exponential_map(self):
@@ -1025,51 +1252,68 @@ def discreteFiber(c, s, B=I3, ndiv=120, invert=False, csym=None, ssym=None):
     c = np.asarray(c).reshape((3, 1))
     s = np.asarray(s).reshape((3, 1))
 
-    nptc = c.shape[1]
-    npts = s.shape[1]
-
     c = unitVector(np.dot(B, c))  # turn c hkls into unit vector in crys frame
     s = unitVector(s)  # convert s to unit vector in samp frame
 
-    retval = []
-    for i_c in range(nptc):
-        dupl_c = np.tile(c[:, i_c], (npts, 1)).T
+    # the rotation axis bisecting c and s; if they are antiparallel, any
+    # axis perpendicular to c will do
+    ax = s + c
+    anrm = columnNorm(ax)
+    if anrm > ztol:
+        ax = ax / anrm
+    else:
+        ax = nullSpace(c)[:, 0].reshape(3, 1)
 
-        ax = s + dupl_c
-        anrm = columnNorm(ax).squeeze()  # should be 1-d
+    # the fiber, arranged as (4, ndiv)
+    qfib = _discrete_fiber(c[:, 0], ax[:, 0], *_fiber_half_angle_trig(ndiv))
+    if csym is not None:
+        qfib = toFundamentalRegion(qfib, crysSym=csym, sampSym=ssym)
+    else:
+        qfib = fixQuat(qfib).squeeze()
 
-        okay = anrm > ztol
-        nokay = okay.sum()
-        if nokay == npts:
-            ax = ax / np.tile(anrm, (3, 1))
-        else:
-            nspace = nullSpace(c[:, i_c].reshape(3, 1))
-            hperp = nspace[:, 0].reshape(3, 1)
-            if nokay == 0:
-                ax = np.tile(hperp, (1, npts))
-            else:
-                ax[:, okay] = ax[:, okay] / np.tile(anrm[okay], (3, 1))
-                ax[:, not okay] = np.tile(hperp, (1, npts - nokay))
+    # c and s are single vectors, so there is just one fiber
+    return [qfib]
 
-        q0 = np.vstack([np.zeros(npts), ax])
 
-        # find rotations
-        # note: the following line fixes bug with use of arange
-        # with float increments
-        phi = np.arange(0, ndiv) * (2 * np.pi / float(ndiv))
-        qh = quatOfAngleAxis(phi, np.tile(c[:, i_c], (ndiv, 1)).T)
+@memoize(maxsize=4)
+def _fiber_half_angle_trig(ndiv):
+    """
+    cos and sin of phi/2 for the ndiv fiber angles phi evenly spaced on
+    [0, 2*pi); these only depend on ndiv, so are cached (read-only)
+    """
+    # note: the following line fixes bug with use of arange
+    # with float increments
+    hphi = 0.5 * (np.arange(0, ndiv) * (_TWO_PI / float(ndiv)))
+    cos_half = np.cos(hphi)
+    sin_half = np.sin(hphi)
+    cos_half.flags.writeable = False
+    sin_half.flags.writeable = False
+    return cos_half, sin_half
 
-        # the fibers, arraged as (npts, 4, ndiv)
-        qfib = np.dot(quatProductMatrix(qh, mult='right'), q0).transpose(
-            2, 1, 0
-        )
-        if csym is not None:
-            retval.append(
-                toFundamentalRegion(qfib.squeeze(), crysSym=csym, sampSym=ssym)
-            )
-        else:
-            retval.append(fixQuat(qfib).squeeze())
-    return retval
+
+@njit(cache=True, nogil=True)
+def _discrete_fiber(c, ax, cos_half, sin_half):
+    # [0, ax] * qh for the rotations qh about c by the angles phi with
+    # the given cos(phi/2) and sin(phi/2)
+    #
+    # with qh = [cos(phi/2), sin(phi/2)*c], the product reduces to
+    #   [-sin(phi/2)*(ax . c), cos(phi/2)*ax + sin(phi/2)*(ax x c)]
+    # so the dot and cross products are computed once for the fiber
+    axc = ax[0] * c[0] + ax[1] * c[1] + ax[2] * c[2]
+    axx0 = ax[1] * c[2] - ax[2] * c[1]
+    axx1 = ax[2] * c[0] - ax[0] * c[2]
+    axx2 = ax[0] * c[1] - ax[1] * c[0]
+
+    ndiv = len(cos_half)
+    qfib = np.empty((4, ndiv))
+    for i in range(ndiv):
+        ch = cos_half[i]
+        sh = sin_half[i]
+        qfib[0, i] = -sh * axc
+        qfib[1, i] = ch * ax[0] + sh * axx0
+        qfib[2, i] = ch * ax[1] + sh * axx1
+        qfib[3, i] = ch * ax[2] + sh * axx2
+    return qfib
 
 
 #
@@ -1084,31 +1328,59 @@ def mapAngle(ang, ang_range=None, units=angularUnits):
     if units.lower() == 'degrees':
         period = 360.0
     elif units.lower() == 'radians':
-        period = 2.0 * np.pi
+        period = _TWO_PI
     else:
         raise RuntimeError(
             "unknown angular units: " + units
         )
 
-    ang = np.nan_to_num(np.atleast_1d(np.float_(ang)))
-
     min_val = -period / 2
     max_val = period / 2
 
     # if we have a specified angular range, use that
     if ang_range is not None:
-        ang_range = np.atleast_1d(np.float_(ang_range))
+        ang_range = np.asarray(ang_range, dtype=float)
 
-        min_val = ang_range.min()
-        max_val = ang_range.max()
+        min_val = float(ang_range.min())
+        max_val = float(ang_range.max())
 
-        if not np.allclose(max_val-min_val, period):
+        # same test as np.allclose, without the array machinery
+        if not abs((max_val - min_val) - period) <= 1e-8 + 1e-5 * period:
             raise RuntimeError('range is incomplete!')
 
-    val = np.mod(ang - min_val, max_val - min_val) + min_val
+    if np.ndim(ang) == 0:
+        # scalar input; skip the array kernel
+        return np.array([_map_angle_scalar(float(ang), min_val, max_val)])
+
+    ang = np.atleast_1d(np.asarray(ang, dtype=float))
+    val = _map_angle(ang.ravel(), min_val, max_val)
+    return val.reshape(ang.shape)
+
+
+@njit(cache=True, nogil=True)
+def _map_angle_scalar(a, min_val, max_val):
+    # nan and inf are first replaced as by np.nan_to_num
+    if np.isnan(a):
+        a = 0.0
+    elif np.isinf(a):
+        a = _FLOAT_MAX if a > 0 else -_FLOAT_MAX
+    if min_val <= a <= max_val:
+        # already in range; leave it as is
+        return a
+    v = np.mod(a - min_val, max_val - min_val) + min_val
     # To match old implementation, map to closer value on the boundary
     # Not doing this breaks hedm_instrument's _extract_polar_maps
-    val[np.logical_and(val == min_val, ang > min_val)] = max_val
+    if v == min_val and a > min_val:
+        v = max_val
+    return v
+
+
+@njit(cache=True, nogil=True)
+def _map_angle(ang, min_val, max_val):
+    # one pass over the angles
+    val = np.empty_like(ang)
+    for i in range(ang.size):
+        val[i] = _map_angle_scalar(ang[i], min_val, max_val)
     return val
 
 
@@ -1120,7 +1392,7 @@ def angularDifference_orig(angList0, angList1, units=angularUnits):
     *) ... maybe more efficient not to vectorize?
     """
     if units == 'radians':
-        period = 2 * np.pi
+        period = _TWO_PI
     elif units == 'degrees':
         period = 360.0
     else:
@@ -1134,15 +1406,54 @@ def angularDifference_orig(angList0, angList1, units=angularUnits):
     return np.abs(np.mod(diffAngles + 0.5 * period, period) - 0.5 * period)
 
 
-def angularDifference_opt(angList0, angList1, units=angularUnits):
+def angularDifference_opt(angList0, angList1, units=angularUnits, out=None):
     """
     Do the proper (acute) angular difference in the context of a branch cut.
 
     *) Default angular range in the code is [-pi, pi]
+    *) If given, the result is written to the float array `out` (of the
+       broadcast shape of the inputs)
     """
-    period = periodDict[units]
-    d = np.abs(angList1 - angList0)
-    return np.minimum(d, period - d)
+    if units == 'radians':
+        return _angular_difference_rad(angList0, angList1, out=out)
+    elif units == 'degrees':
+        return _angular_difference_deg(angList0, angList1, out=out)
+    else:
+        raise RuntimeError(
+            "'%s' is an unrecognized option for angular units!" % (units)
+        )
+
+
+@njit(cache=True, nogil=True)
+def _angular_difference(a0, a1, period):
+    # min(|a1 - a0|, period - |a1 - a0|)
+    d = abs(a1 - a0)
+    # nan is passed through; it is kept out of the ordered comparison,
+    # which would otherwise raise numpy's "invalid value" warning when
+    # vectorized
+    isnan = d != d
+    if isnan:
+        d = 0.0
+    pd = period - d
+    return a1 - a0 if isnan else (d if d < pd else pd)
+
+
+# fused elementwise kernels with the period of each unit built in; the
+# plain numpy ufuncs are cheaper to call than numba's wrappers
+@vectorize(['float32(float32, float32)', 'float64(float64, float64)'],
+           cache=True)
+def _angular_difference_rad_kernel(a0, a1):
+    return _angular_difference(a0, a1, _TWO_PI)
+
+
+@vectorize(['float32(float32, float32)', 'float64(float64, float64)'],
+           cache=True)
+def _angular_difference_deg_kernel(a0, a1):
+    return _angular_difference(a0, a1, 360.0)
+
+
+_angular_difference_rad = _angular_difference_rad_kernel.ufunc
+_angular_difference_deg = _angular_difference_deg_kernel.ufunc
 
 
 angularDifference = angularDifference_opt
@@ -1155,26 +1466,45 @@ def applySym(vec, qsym, csFlag=False, cullPM=False, tol=cnst.sqrt_epsf):
     csFlag : centrosymmetry flag
     cullPM : cull +/- flag
     """
-    nsym = qsym.shape[1]
-    Rsym = rotMatOfQuat(qsym)
-    if nsym == 1:
-        Rsym = np.array(
-            [
-                Rsym,
-            ]
-        )
-    allhkl = (
-        multMatArray(Rsym, np.tile(vec, (nsym, 1, 1)))
-        .swapaxes(1, 2)
-        .reshape(nsym, 3)
-        .T
-    )
+    # the (3, nsym) array of Rsym[k] * vec
+    Rsym = rotMatOfQuat(qsym).reshape(-1, 3, 3)
+    allhkl = np.einsum('kij,j->ik', Rsym, np.ravel(vec))
 
     if csFlag:
         allhkl = np.hstack([allhkl, -1 * allhkl])
-    _, uid = findDuplicateVectors(allhkl, tol=tol, equivPM=cullPM)
+    uid = _unique_vector_ids(allhkl, tol, cullPM)
 
-    return allhkl[np.ix_(list(range(3)), uid)]
+    return allhkl[:, uid]
+
+
+@njit(cache=True, nogil=True)
+def _unique_vector_ids(vec, tol, equivPM):
+    """
+    Indices of the columns of vec left after culling duplicates
+
+    Same criterion as `findDuplicateVectors`, which also builds the lists
+    of equivalent columns: each column marks every later column that is
+    not yet marked and lies within tol of it (or of its negative, if
+    equivPM) in the 1-norm; the unmarked columns are returned in order.
+    """
+    n, m = vec.shape
+    dupl = np.zeros(m, dtype=np.bool_)
+    for ii in range(m):
+        for jj in range(ii + 1, m):
+            if dupl[jj]:
+                continue
+            diff = 0.0
+            for k in range(n):
+                diff += np.abs(vec[k, ii] - vec[k, jj])
+            if diff < tol:
+                dupl[jj] = True
+            elif equivPM:
+                diff = 0.0
+                for k in range(n):
+                    diff += np.abs(vec[k, ii] + vec[k, jj])
+                if diff < tol:
+                    dupl[jj] = True
+    return np.flatnonzero(~dupl)
 
 
 # =============================================================================
@@ -1211,35 +1541,30 @@ def toFundamentalRegion(q, crysSym='Oh', sampSym=None):
         assert m3 == 4, 'your 3-d quaternion array isn\'t the right shape'
         q = q.transpose(0, 2, 1).reshape(l3 * n3, 4).T
     if isinstance(crysSym, str):
-        qsym_c = quatProductMatrix(
-            quatOfLaueGroup(crysSym), 'right'
-        )  # crystal symmetry operator
+        qsym_c = quatOfLaueGroup(crysSym)  # crystal symmetry operators
     else:
-        qsym_c = quatProductMatrix(crysSym, 'right')
+        qsym_c = crysSym
 
     n = q.shape[1]  # total number of quats
-    m = qsym_c.shape[0]  # number of symmetry operations
-
-    #
-    # MAKE EQUIVALENCE CLASS
-    #
-    # Do R * Gc, store as
-    # [q[:, 0] * Gc[:, 0:m], ..., 2[:, n-1] * Gc[:, 0:m]]
-    qeqv = np.dot(qsym_c, q).transpose(2, 0, 1).reshape(m * n, 4).T
+    m = qsym_c.shape[1]  # number of symmetry operations
 
     if sampSym is None:
-        # need to fix quats to sort
-        qeqv = fixQuat(qeqv)
-
-        # Reshape scalar comp columnwise by point in qeqv
-        q0 = qeqv[0, :].reshape(n, m).T
-
-        # Find q0 closest to origin for each n equivalence classes
-        q0maxColInd = np.argmax(q0, 0) + [x * m for x in range(n)]
-
-        # store representatives in qr
-        qr = qeqv[:, q0maxColInd]
+        # Find the equivalent R * Gc closest to the origin for each of the
+        # n equivalence classes and store the representatives in qr
+        qr = np.empty((4, n))
+        _to_fundamental_region(
+            np.asarray(q, dtype=float), np.asarray(qsym_c, dtype=float), qr
+        )
     else:
+        #
+        # MAKE EQUIVALENCE CLASS
+        #
+        # Do R * Gc, store as the (4, m, n) array
+        # [q[:, 0:n] * Gc[:, 0], ..., q[:, 0:n] * Gc[:, m-1]]
+        qeqv = np.einsum(
+            'kij,jl->ikl', quatProductMatrix(qsym_c, 'right'), q
+        )
+
         if isinstance(sampSym, str):
             qsym_s = quatProductMatrix(
                 quatOfLaueGroup(sampSym), 'left'
@@ -1249,13 +1574,10 @@ def toFundamentalRegion(q, crysSym='Oh', sampSym=None):
 
         p = qsym_s.shape[0]  # number of sample symmetry operations
 
-        # Do Gs * (R * Gc), store as
-        # [Gs[:, 0:p]*q[:,   0]*Gc[:, 0], ..., Gs[:, 0:p]*q[:,   0]*Gc[:, m-1],
-        #  ...,
-        #  Gs[:, 0:p]*q[:, n-1]*Gc[:, 0], ..., Gs[:, 0:p]*q[:, n-1]*Gc[:, m-1]]
-        qeqv = fixQuat(
-            np.dot(qsym_s, qeqv).transpose(2, 0, 1).reshape(p * m * n, 4).T
-        )
+        # Do Gs * (R * Gc), store as the (4, p, m, n) array; it is
+        # contiguous, so it is fixed through a flat (4, p*m*n) view
+        qeqv = np.einsum('kij,jmn->ikmn', qsym_s, qeqv)
+        qeqv = fixQuat(qeqv.reshape(4, p * m * n)).reshape(4, p, m, n)
 
         raise NotImplementedError
 
@@ -1263,11 +1585,37 @@ def toFundamentalRegion(q, crysSym='Oh', sampSym=None):
     assert qr.shape[1] == n, 'oops, something wrong here with your reshaping'
 
     if qdims == 3:
-        qr = qr.T.reshape(l3, n3, 4).transpose(0, 2, 1)
+        qr = qr.reshape(4, l3, n3).transpose(1, 0, 2)
 
     return qr
 
 
+@njit(cache=True, nogil=True)
+def _to_fundamental_region(q, qsym, qr):
+    """
+    Pick the representatives of quaternions in the fundamental region
+
+    For each of the (4, n) quaternions q, the products q * qsym with the
+    (4, m) symmetry operators are normalized and flipped to a nonnegative
+    scalar part as in `fixQuat`; the one with the largest scalar part
+    (the first, if tied) is written to the (4, n) array `qr`.
+    """
+    for j in range(q.shape[1]):
+        best = 0.0
+        for k in range(qsym.shape[1]):
+            w, x, y, z = _quat_mult(
+                q[0, j], q[1, j], q[2, j], q[3, j],
+                qsym[0, k], qsym[1, k], qsym[2, k], qsym[3, k]
+            )
+            w, x, y, z = _fix_quat_components(w, x, y, z)
+            if k == 0 or w > best:
+                best = w
+                qr[0, j] = w
+                qr[1, j] = x
+                qr[2, j] = y
+                qr[3, j] = z
+
+
 def ltypeOfLaueGroup(tag):
     """
     Yield lattice type of input tag.
@@ -1364,142 +1712,158 @@ def quatOfLaueGroup(tag):
     if not isinstance(tag, str):
         raise RuntimeError("entered flag is not a string!")
 
-    if tag.lower() == 'ci' or tag.lower() == 's2':
-        # TRICLINIC
-        angleAxis = np.vstack([0.0, 1.0, 0.0, 0.0])  # identity
-    elif tag.lower() == 'c2h':
-        # MONOCLINIC
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [np.pi, 0, 1, 0],  # twofold about 010 (x2)
-        ]
-    elif tag.lower() == 'd2h' or tag.lower() == 'vh':
-        # ORTHORHOMBIC
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [np.pi, 1, 0, 0],  # twofold about 100
-            [np.pi, 0, 1, 0],  # twofold about 010
-            [np.pi, 0, 0, 1],  # twofold about 001
-        ]
-    elif tag.lower() == 'c4h':
-        # TETRAGONAL (LOW)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [piby2, 0, 0, 1],  # fourfold about 001 (x3)
-            [np.pi, 0, 0, 1],  #
-            [piby2 * 3, 0, 0, 1],  #
-        ]
-    elif tag.lower() == 'd4h':
-        # TETRAGONAL (HIGH)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [piby2, 0, 0, 1],  # fourfold about 0  0  1 (x3)
-            [np.pi, 0, 0, 1],  #
-            [piby2 * 3, 0, 0, 1],  #
-            [np.pi, 1, 0, 0],  # twofold about  1  0  0 (x1)
-            [np.pi, 0, 1, 0],  # twofold about  0  1  0 (x2)
-            [np.pi, 1, 1, 0],  # twofold about  1  1  0
-            [np.pi, -1, 1, 0],  # twofold about -1  1  0
-        ]
-    elif tag.lower() == 'c3i' or tag.lower() == 's6':
-        # TRIGONAL (LOW)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [piby3 * 2, 0, 0, 1],  # threefold about 0001 (x3,c)
-            [piby3 * 4, 0, 0, 1],  #
-        ]
-    elif tag.lower() == 'd3d':
-        # TRIGONAL (HIGH)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [piby3 * 2, 0, 0, 1],  # threefold about 0001 (x3,c)
-            [piby3 * 4, 0, 0, 1],  #
-            [np.pi, 1, 0, 0],  # twofold about  2 -1 -1  0 (x1,a1)
-            [np.pi, -0.5, sq3by2, 0],  # twofold about -1  2 -1  0 (a2)
-            [np.pi, -0.5, -sq3by2, 0],  # twofold about -1 -1  2  0 (a3)
-        ]
-    elif tag.lower() == 'c6h':
-        # HEXAGONAL (LOW)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [piby3, 0, 0, 1],  # sixfold about 0001 (x3,c)
-            [piby3 * 2, 0, 0, 1],  #
-            [np.pi, 0, 0, 1],  #
-            [piby3 * 4, 0, 0, 1],  #
-            [piby3 * 5, 0, 0, 1],  #
-        ]
-    elif tag.lower() == 'd6h':
-        # HEXAGONAL (HIGH)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [piby3, 0, 0, 1],  # sixfold about  0  0  1 (x3,c)
-            [piby3 * 2, 0, 0, 1],  #
-            [np.pi, 0, 0, 1],  #
-            [piby3 * 4, 0, 0, 1],  #
-            [piby3 * 5, 0, 0, 1],  #
-            [np.pi, 1, 0, 0],  # twofold about  2 -1  0 (x1,a1)
-            [np.pi, -0.5, sq3by2, 0],  # twofold about -1  2  0 (a2)
-            [np.pi, -0.5, -sq3by2, 0],  # twofold about -1 -1  0 (a3)
-            [np.pi, sq3by2, 0.5, 0],  # twofold about  1  0  0
-            [np.pi, 0, 1, 0],  # twofold about -1  1  0 (x2)
-            [np.pi, -sq3by2, 0.5, 0],  # twofold about  0 -1  0
-        ]
-    elif tag.lower() == 'th':
-        # CUBIC (LOW)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [np.pi, 1, 0, 0],  # twofold about    1  0  0 (x1)
-            [np.pi, 0, 1, 0],  # twofold about    0  1  0 (x2)
-            [np.pi, 0, 0, 1],  # twofold about    0  0  1 (x3)
-            [piby3 * 2, 1, 1, 1],  # threefold about  1  1  1
-            [piby3 * 4, 1, 1, 1],  #
-            [piby3 * 2, -1, 1, 1],  # threefold about -1  1  1
-            [piby3 * 4, -1, 1, 1],  #
-            [piby3 * 2, -1, -1, 1],  # threefold about -1 -1  1
-            [piby3 * 4, -1, -1, 1],  #
-            [piby3 * 2, 1, -1, 1],  # threefold about  1 -1  1
-            [piby3 * 4, 1, -1, 1],  #
-        ]
-    elif tag.lower() == 'oh':
-        # CUBIC (HIGH)
-        angleAxis = np.c_[
-            [0.0, 1, 0, 0],  # identity
-            [piby2, 1, 0, 0],  # fourfold about   1  0  0 (x1)
-            [np.pi, 1, 0, 0],  #
-            [piby2 * 3, 1, 0, 0],  #
-            [piby2, 0, 1, 0],  # fourfold about   0  1  0 (x2)
-            [np.pi, 0, 1, 0],  #
-            [piby2 * 3, 0, 1, 0],  #
-            [piby2, 0, 0, 1],  # fourfold about   0  0  1 (x3)
-            [np.pi, 0, 0, 1],  #
-            [piby2 * 3, 0, 0, 1],  #
-            [piby3 * 2, 1, 1, 1],  # threefold about  1  1  1
-            [piby3 * 4, 1, 1, 1],  #
-            [piby3 * 2, -1, 1, 1],  # threefold about -1  1  1
-            [piby3 * 4, -1, 1, 1],  #
-            [piby3 * 2, -1, -1, 1],  # threefold about -1 -1  1
-            [piby3 * 4, -1, -1, 1],  #
-            [piby3 * 2, 1, -1, 1],  # threefold about  1 -1  1
-            [piby3 * 4, 1, -1, 1],  #
-            [np.pi, 1, 1, 0],  # twofold about    1  1  0
-            [np.pi, -1, 1, 0],  # twofold about   -1  1  0
-            [np.pi, 1, 0, 1],  # twofold about    1  0  1
-            [np.pi, 0, 1, 1],  # twofold about    0  1  1
-            [np.pi, -1, 0, 1],  # twofold about   -1  0  1
-            [np.pi, 0, -1, 1],  # twofold about    0 -1  1
-        ]
-    else:
+    qsym = _LAUE_QSYM.get(_LAUE_ALIASES.get(tag.lower(), tag.lower()))
+    if qsym is None:
         raise RuntimeError(
             "unrecognized symmetry group.  "
             + "See ``help(quatOfLaueGroup)'' for a list of valid options.  "
             + "Oh, and have a great day ;-)"
         )
 
+    # hand out copies of the shared arrays
+    return qsym.copy()
+
+
+# angles and (unnormalized) axes of the rotations in each Laue group;
+# the conventions are described in quatOfLaueGroup
+_LAUE_ANGLE_AXIS = {
+    # TRICLINIC
+    'ci': np.vstack([0.0, 1.0, 0.0, 0.0]),  # identity
+    # MONOCLINIC
+    'c2h': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [np.pi, 0, 1, 0],  # twofold about 010 (x2)
+    ],
+    # ORTHORHOMBIC
+    'd2h': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [np.pi, 1, 0, 0],  # twofold about 100
+        [np.pi, 0, 1, 0],  # twofold about 010
+        [np.pi, 0, 0, 1],  # twofold about 001
+    ],
+    # TETRAGONAL (LOW)
+    'c4h': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [piby2, 0, 0, 1],  # fourfold about 001 (x3)
+        [np.pi, 0, 0, 1],  #
+        [piby2 * 3, 0, 0, 1],  #
+    ],
+    # TETRAGONAL (HIGH)
+    'd4h': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [piby2, 0, 0, 1],  # fourfold about 0  0  1 (x3)
+        [np.pi, 0, 0, 1],  #
+        [piby2 * 3, 0, 0, 1],  #
+        [np.pi, 1, 0, 0],  # twofold about  1  0  0 (x1)
+        [np.pi, 0, 1, 0],  # twofold about  0  1  0 (x2)
+        [np.pi, 1, 1, 0],  # twofold about  1  1  0
+        [np.pi, -1, 1, 0],  # twofold about -1  1  0
+    ],
+    # TRIGONAL (LOW)
+    'c3i': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [piby3 * 2, 0, 0, 1],  # threefold about 0001 (x3,c)
+        [piby3 * 4, 0, 0, 1],  #
+    ],
+    # TRIGONAL (HIGH)
+    'd3d': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [piby3 * 2, 0, 0, 1],  # threefold about 0001 (x3,c)
+        [piby3 * 4, 0, 0, 1],  #
+        [np.pi, 1, 0, 0],  # twofold about  2 -1 -1  0 (x1,a1)
+        [np.pi, -0.5, sq3by2, 0],  # twofold about -1  2 -1  0 (a2)
+        [np.pi, -0.5, -sq3by2, 0],  # twofold about -1 -1  2  0 (a3)
+    ],
+    # HEXAGONAL (LOW)
+    'c6h': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [piby3, 0, 0, 1],  # sixfold about 0001 (x3,c)
+        [piby3 * 2, 0, 0, 1],  #
+        [np.pi, 0, 0, 1],  #
+        [piby3 * 4, 0, 0, 1],  #
+        [piby3 * 5, 0, 0, 1],  #
+    ],
+    # HEXAGONAL (HIGH)
+    'd6h': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [piby3, 0, 0, 1],  # sixfold about  0  0  1 (x3,c)
+        [piby3 * 2, 0, 0, 1],  #
+        [np.pi, 0, 0, 1],  #
+        [piby3 * 4, 0, 0, 1],  #
+        [piby3 * 5, 0, 0, 1],  #
+        [np.pi, 1, 0, 0],  # twofold about  2 -1  0 (x1,a1)
+        [np.pi, -0.5, sq3by2, 0],  # twofold about -1  2  0 (a2)
+        [np.pi, -0.5, -sq3by2, 0],  # twofold about -1 -1  0 (a3)
+        [np.pi, sq3by2, 0.5, 0],  # twofold about  1  0  0
+        [np.pi, 0, 1, 0],  # twofold about -1  1  0 (x2)
+        [np.pi, -sq3by2, 0.5, 0],  # twofold about  0 -1  0
+    ],
+    # CUBIC (LOW)
+    'th': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [np.pi, 1, 0, 0],  # twofold about    1  0  0 (x1)
+        [np.pi, 0, 1, 0],  # twofold about    0  1  0 (x2)
+        [np.pi, 0, 0, 1],  # twofold about    0  0  1 (x3)
+        [piby3 * 2, 1, 1, 1],  # threefold about  1  1  1
+        [piby3 * 4, 1, 1, 1],  #
+        [piby3 * 2, -1, 1, 1],  # threefold about -1  1  1
+        [piby3 * 4, -1, 1, 1],  #
+        [piby3 * 2, -1, -1, 1],  # threefold about -1 -1  1
+        [piby3 * 4, -1, -1, 1],  #
+        [piby3 * 2, 1, -1, 1],  # threefold about  1 -1  1
+        [piby3 * 4, 1, -1, 1],  #
+    ],
+    # CUBIC (HIGH)
+    'oh': np.c_[
+        [0.0, 1, 0, 0],  # identity
+        [piby2, 1, 0, 0],  # fourfold about   1  0  0 (x1)
+        [np.pi, 1, 0, 0],  #
+        [piby2 * 3, 1, 0, 0],  #
+        [piby2, 0, 1, 0],  # fourfold about   0  1  0 (x2)
+        [np.pi, 0, 1, 0],  #
+        [piby2 * 3, 0, 1, 0],  #
+        [piby2, 0, 0, 1],  # fourfold about   0  0  1 (x3)
+        [np.pi, 0, 0, 1],  #
+        [piby2 * 3, 0, 0, 1],  #
+        [piby3 * 2, 1, 1, 1],  # threefold about  1  1  1
+        [piby3 * 4, 1, 1, 1],  #
+        [piby3 * 2, -1, 1, 1],  # threefold about -1  1  1
+        [piby3 * 4, -1, 1, 1],  #
+        [piby3 * 2, -1, -1, 1],  # threefold about -1 -1  1
+        [piby3 * 4, -1, -1, 1],  #
+        [piby3 * 2, 1, -1, 1],  # threefold about  1 -1  1
+        [piby3 * 4, 1, -1, 1],  #
+        [np.pi, 1, 1, 0],  # twofold about    1  1  0
+        [np.pi, -1, 1, 0],  # twofold about   -1  1  0
+        [np.pi, 1, 0, 1],  # twofold about    1  0  1
+        [np.pi, 0, 1, 1],  # twofold about    0  1  1
+        [np.pi, -1, 0, 1],  # twofold about   -1  0  1
+        [np.pi, 0, -1, 1],  # twofold about    0 -1  1
+    ],
+}
+
+# alternate symbols for some of the groups
+_LAUE_ALIASES = {'s2': 'ci', 'vh': 'd2h', 's6': 'c3i'}
+
+
+def _laue_group_quats():
+    # all of the groups are converted in a single call, then split
+    angleAxis = np.hstack(list(_LAUE_ANGLE_AXIS.values()))
     angle = angleAxis[0, ]
     axis = angleAxis[1:, ]
 
     #  Note: Axis does not need to be normalized in call to quatOfAngleAxis
-    #  05/01/2014 JVB -- made output a contiguous C-ordered array
-    qsym = np.array(quatOfAngleAxis(angle, axis).T, order='C').T
+    qsym = quatOfAngleAxis(angle, axis)
+
+    # store each group as a contiguous C-ordered (4, N) array
+    ends = np.cumsum([x.shape[1] for x in _LAUE_ANGLE_AXIS.values()])
+    laue_qsym = {}
+    for tag, q in zip(_LAUE_ANGLE_AXIS, np.split(qsym, ends[:-1], axis=1)):
+        q = np.ascontiguousarray(q)
+        q.flags.writeable = False
+        laue_qsym[tag] = q
+    return laue_qsym
+
 
-    return qsym
+# the quaternions of each Laue group, built once at import
+_LAUE_QSYM = _laue_group_quats()
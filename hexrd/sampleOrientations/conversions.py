@@ -42,56 +42,84 @@ def cu2ho(cu):
     assert ma <= ap_2, "point outside cubochoric grid"
     pyd = getPyramid(cu)
 
+    # work with scalars; only the result is allocated
     if pyd == 1 or pyd == 2:
-        sXYZ = cu
+        x, y, z = cu[0], cu[1], cu[2]
     elif pyd == 3 or pyd == 4:
-        sXYZ = np.array([cu[1], cu[2], cu[0]])
-    elif pyd == 5 or pyd == 6:
-        sXYZ = np.array([cu[2], cu[0], cu[1]])
+        x, y, z = cu[1], cu[2], cu[0]
+    else:
+        x, y, z = cu[2], cu[0], cu[1]
 
-    xyz = sXYZ * sc
-    ma = np.max(np.abs(xyz))
+    x = x * sc
+    y = y * sc
+    z = z * sc
+    ma = max(np.abs(x), np.abs(y), np.abs(z))
     if ma < 1E-8:
         return np.array([0.0, 0.0, 0.0])
 
-    ma2 = np.max(np.abs(xyz[0:2]))
+    ma2 = max(np.abs(x), np.abs(y))
     if ma2 < 1E-8:
-        LamXYZ = np.array([0.0, 0.0, constants.pref * xyz[2]])
+        lx = 0.0
+        ly = 0.0
+        lz = constants.pref * z
 
     else:
-        if np.abs(xyz[1]) <= np.abs(xyz[0]):
-            q = (np.pi/12.0) * xyz[1]/xyz[0]
+        if np.abs(y) <= np.abs(x):
+            q = (np.pi/12.0) * y/x
             c = np.cos(q)
             s = np.sin(q)
-            q = constants.prek * xyz[0] / np.sqrt(np.sqrt(2.0)-c)
+            q = constants.prek * x / np.sqrt(np.sqrt(2.0)-c)
             T1 = (np.sqrt(2.0) * c - 1.0) * q
             T2 = np.sqrt(2.0) * s * q
         else:
-            q = (np.pi/12.0) * xyz[0]/xyz[1]
+            q = (np.pi/12.0) * x/y
             c = np.cos(q)
             s = np.sin(q)
-            q = constants.prek * xyz[1] / np.sqrt(np.sqrt(2.0)-c)
+            q = constants.prek * y / np.sqrt(np.sqrt(2.0)-c)
             T1 = np.sqrt(2.0) * s * q
             T2 = (np.sqrt(2.0) * c - 1.0) * q
 
         c = T1**2 + T2**2
-        s = np.pi * c / (24.0 * xyz[2]**2)
-        c = np.sqrt(np.pi) * c / np.sqrt(24.0) / xyz[2]
+        s = np.pi * c / (24.0 * z**2)
+        c = np.sqrt(np.pi) * c / np.sqrt(24.0) / z
         q = np.sqrt( 1.0 - s )
-        LamXYZ = np.array([T1 * q, T2 * q, constants.pref * xyz[2] - c])
+        lx = T1 * q
+        ly = T2 * q
+        lz = constants.pref * z - c
 
     if pyd == 1 or pyd == 2:
-        return LamXYZ
+        return np.array([lx, ly, lz])
     elif pyd == 3 or pyd == 4:
-        return np.array([LamXYZ[2], LamXYZ[0], LamXYZ[1]])
-    elif pyd == 5 or pyd == 6:
-        return np.array([LamXYZ[1], LamXYZ[2], LamXYZ[0]])
+        return np.array([lz, lx, ly])
+    else:
+        return np.array([ly, lz, lx])
 
 
 @njit(cache=True, nogil=True)
 def ho2ro(ho):
-    ax = ho2ax(ho)
-    return ax2ro(ax)
+    # same as ax2ro(ho2ax(ho)), without the intermediate axis-angle pair
+    hmag = ho[0]**2 + ho[1]**2 + ho[2]**2
+    if hmag < 1E-8:
+        return np.array([0.0, 0.0, 1.0, 0.0])
+    hm = hmag
+    s = constants.tfit[0] + constants.tfit[1] * hmag
+    for ii in range(2, 21):
+        hm = hm*hmag
+        s = s + constants.tfit[ii] * hm
+    s = 2.0 * np.arccos(s)
+    if np.abs(s) < 1E-8:
+        return np.array([0.0, 0.0, 1.0, 0.0])
+
+    hr = np.sqrt(hmag)
+    ro = np.empty(4)
+    ro[0] = ho[0]/hr
+    ro[1] = ho[1]/hr
+    ro[2] = ho[2]/hr
+    if np.abs(s - np.pi) < 1E-8:
+        ro[3] = np.inf
+    else:
+        ro[3] = np.tan(s*0.5)
+    return ro
 
 
 @njit(cache=True, nogil=True)
@@ -127,8 +155,31 @@ def ax2ro(ax):
 
 @njit(cache=True, nogil=True)
 def ro2qu(ro):
-    ax = ro2ax(ro)
-    return ax2qu(ax)
+    # same as ax2qu(ro2ax(ro)), without the intermediate axis-angle pair
+    qu = np.empty(4)
+    if np.abs(ro[3]) < 1E-8:
+        qu[0] = 1.0
+        qu[1] = 0.0
+        qu[2] = 0.0
+        qu[3] = 0.0
+    elif ro[3] == np.inf:
+        # half turn; sin(pi/2) is exactly one
+        qu[0] = np.cos(np.pi*0.5)
+        qu[1] = ro[0]
+        qu[2] = ro[1]
+        qu[3] = ro[2]
+    else:
+        # the half angle is arctan(ro[3]), which is never below the
+        # 1E-8 cutoff in ax2qu here
+        ang = 2.0*np.arctan(ro[3])
+        mag = 1.0/np.sqrt(ro[0]**2 + ro[1]**2 + ro[2]**2)
+        c = np.cos(ang*0.5)
+        s = np.sin(ang*0.5)
+        qu[0] = c
+        qu[1] = ro[0]*mag*s
+        qu[2] = ro[1]*mag*s
+        qu[3] = ro[2]*mag*s
+    return qu
 
 
 @njit(cache=True, nogil=True)
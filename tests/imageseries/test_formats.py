@@ -1,11 +1,14 @@
+import gc
 import os
+import pickle
 import tempfile
 import unittest
 
+import h5py
 import numpy as np
 
 from .common import ImageSeriesTest
-from .common import make_array_ims, compare, compare_meta
+from .common import make_array_ims, compare, compare_meta, random_array
 
 from hexrd import imageseries
 
@@ -78,6 +81,193 @@ class TestFormatH5(ImageSeriesFormatTest):
         self.assertAlmostEqual(diff, 0., "h5 reconstruction failed")
         self.assertTrue(compare_meta(self.is_a, is_h))
 
+    def test_fmth5_2d(self):
+        """HDF5 format with a single 2-d image"""
+        a = random_array[0]
+        with h5py.File(self.h5file, 'w') as f:
+            f.create_dataset('/'.join([self.h5path, 'images']), data=a)
+        is_h = imageseries.open(self.h5file, self.fmt, path=self.h5path)
+
+        self.assertEqual(len(is_h), 1)
+        self.assertEqual(is_h.shape, a.shape)
+        self.assertTrue(np.array_equal(is_h[0], a))
+        with self.assertRaises(IndexError):
+            is_h[1]
+
+    def test_fmth5_multiframe_chunks(self):
+        """HDF5 format with chunks spanning several frames"""
+        with h5py.File(self.h5file, 'w') as f:
+            f.create_dataset(
+                '/'.join([self.h5path, 'images']), data=random_array,
+                chunks=(2, 5, 7), compression='gzip'
+            )
+        is_h = imageseries.open(self.h5file, self.fmt, path=self.h5path)
+
+        for i in (0, 2, 1, -1):
+            self.assertTrue(np.array_equal(is_h[i], random_array[i]))
+        self.assertTrue(np.array_equal(is_h[1:3], random_array[1:3]))
+        with self.assertRaises(IndexError):
+            is_h[3]
+
+        # returned frames must not alias the cached blocks
+        is_h[0][:] = 0
+        self.assertTrue(np.array_equal(is_h[0], random_array[0]))
+
+    def test_fmth5_cache_nbytes(self):
+        """HDF5 format: one memory budget for the chunk and block caches"""
+        with h5py.File(self.h5file, 'w') as f:
+            f.create_dataset(
+                '/'.join([self.h5path, 'images']), data=random_array,
+                chunks=(2, 5, 7), compression='gzip'
+            )
+        block_nbytes = 2 * random_array[0].nbytes
+        for cache_nbytes, block_nframes in ((None, 2), (block_nbytes, 2),
+                                            (block_nbytes - 1, None)):
+            kwargs = {} if cache_nbytes is None else {
+                'cache_nbytes': cache_nbytes
+            }
+            is_h = imageseries.open(self.h5file, self.fmt, path=self.h5path,
+                                    **kwargs)
+            adapter = pickle.loads(pickle.dumps(is_h._adapter))
+            for a in (is_h._adapter, adapter):
+                self.assertEqual(a._block_nframes, block_nframes)
+                ds = a._HDF5ImageSeriesAdapter__image_dataset
+                rdcc_nbytes = ds.id.get_access_plist().get_chunk_cache()[1]
+                if block_nframes is None:
+                    self.assertEqual(rdcc_nbytes, cache_nbytes)
+                else:
+                    self.assertEqual(rdcc_nbytes, 0)
+                self.assertTrue(np.array_equal(a[1], random_array[1]))
+                a.close()
+
+    def test_fmth5_contiguous(self):
+        """HDF5 format with contiguous, uncompressed image data"""
+        with h5py.File(self.h5file, 'w') as f:
+            f.create_dataset(
+                '/'.join([self.h5path, 'images']), data=random_array
+            )
+        is_h = imageseries.open(self.h5file, self.fmt, path=self.h5path)
+
+        self.assertEqual(len(is_h), len(random_array))
+        self.assertEqual(is_h.shape, random_array.shape[1:])
+        self.assertTrue(np.array_equal(is_h[1], random_array[1]))
+        self.assertTrue(np.array_equal(is_h[::2], random_array[::2]))
+        self.assertTrue(
+            np.array_equal(list(is_h._adapter.iterframes()), random_array)
+        )
+
+        # frames are independent, writable arrays
+        frame = is_h[0]
+        frame[:] = 0
+        self.assertTrue(np.array_equal(is_h[0], random_array[0]))
+
+    def test_fmth5_pickle(self):
+        """HDF5 format: pickled adapters reopen the file for reading"""
+        imageseries.write(self.is_a, self.h5file, self.fmt, path=self.h5path)
+        is_h = imageseries.open(self.h5file, self.fmt, path=self.h5path)
+
+        adapter = pickle.loads(pickle.dumps(is_h._adapter))
+        is_p = imageseries.ImageSeries(adapter)
+
+        diff = compare(self.is_a, is_p)
+        self.assertAlmostEqual(diff, 0., "h5 pickle round-trip failed")
+        self.assertTrue(compare_meta(self.is_a, is_p))
+
+    def test_fmth5_reopen(self):
+        """HDF5 format: files already open in this process can be reopened"""
+        imageseries.write(self.is_a, self.h5file, self.fmt, path=self.h5path)
+        for mode in ('r', 'a'):
+            with h5py.File(self.h5file, mode) as f:
+                is_1 = imageseries.open(self.h5file, self.fmt,
+                                        path=self.h5path)
+                is_2 = imageseries.open(self.h5file, self.fmt,
+                                        path=self.h5path)
+                self.assertAlmostEqual(compare(is_1, is_2), 0.,
+                                       "h5 reopen failed")
+
+                is_f = imageseries.open(f, self.fmt, path=self.h5path)
+                adapter = pickle.loads(pickle.dumps(is_f._adapter))
+                is_p = imageseries.ImageSeries(adapter)
+                diff = compare(self.is_a, is_p)
+                self.assertAlmostEqual(diff, 0., "h5 pickle of file failed")
+
+            for ims in (is_1, is_2, is_p):
+                ims._adapter.close()
+
+    def test_fmth5_read_batch(self):
+        """HDF5 format: reading several frames at once"""
+        idx = [2, 0, 2, -2]
+        for chunks in ((1, 5, 7), (2, 5, 7), None):
+            with h5py.File(self.h5file, 'w') as f:
+                f.create_dataset(
+                    '/'.join([self.h5path, 'images']), data=random_array,
+                    chunks=chunks
+                )
+            is_h = imageseries.open(self.h5file, self.fmt, path=self.h5path)
+            adapter = is_h._adapter
+
+            frames = adapter.read_batch(idx)
+            self.assertTrue(np.array_equal(frames, random_array[idx]))
+            self.assertEqual(adapter.read_batch([]).shape, (0, 5, 7))
+            with self.assertRaises(IndexError):
+                adapter.read_batch([0, 3])
+            for bad_idx in ([1.7], [True, False]):
+                with self.assertRaises(TypeError):
+                    adapter.read_batch(bad_idx)
+            del is_h, adapter
+
+    def test_fmth5_dtype(self):
+        """HDF5 format: converting frames to a requested dtype on read"""
+        for chunks in ((1, 5, 7), (2, 5, 7), None):
+            with h5py.File(self.h5file, 'w') as f:
+                f.create_dataset(
+                    '/'.join([self.h5path, 'images']),
+                    data=random_array.astype(np.uint16), chunks=chunks
+                )
+            is_h = imageseries.open(
+                self.h5file, self.fmt, path=self.h5path, dtype=np.float32
+            )
+            adapter = is_h._adapter
+
+            self.assertEqual(is_h.dtype, np.float32)
+            self.assertEqual(is_h[1].dtype, np.float32)
+            self.assertTrue(np.array_equal(is_h[1], random_array[1]))
+            self.assertEqual(is_h[0:2].dtype, np.float32)
+            self.assertEqual(adapter.read_batch([2, 0]).dtype, np.float32)
+            for frame in adapter.iterframes():
+                self.assertEqual(frame.dtype, np.float32)
+            del is_h, adapter
+
+    def test_fmth5_close(self):
+        """HDF5 format: the h5py file is closed along with the adapter"""
+        imageseries.write(self.is_a, self.h5file, self.fmt, path=self.h5path)
+
+        f = h5py.File(self.h5file, 'r')
+        is_h = imageseries.open(f, self.fmt, path=self.h5path)
+        is_h._adapter.close()
+        is_h._adapter.close()
+        self.assertFalse(f)
+
+        f = h5py.File(self.h5file, 'r')
+        is_h = imageseries.open(f, self.fmt, path=self.h5path)
+        del is_h
+        gc.collect()
+        self.assertFalse(f)
+
+    def test_fmth5_iterframes(self):
+        """HDF5 format: direct frame iteration"""
+        imageseries.write(self.is_a, self.h5file, self.fmt, path=self.h5path)
+        is_h = imageseries.open(self.h5file, self.fmt, path=self.h5path)
+        adapter = is_h._adapter
+
+        frames = list(adapter.iterframes())
+        self.assertTrue(np.array_equal(frames, random_array))
+
+        buf = np.empty(is_h.shape, dtype=is_h.dtype)
+        for i, frame in enumerate(adapter.iterframes(out=buf)):
+            self.assertIs(frame, buf)
+            self.assertTrue(np.array_equal(frame, random_array[i]))
+
 
 class TestFormatFrameCache(ImageSeriesFormatTest):
 
@@ -134,3 +134,29 @@ def test_exp_map_setter():
         rot1.extrinsic = rot2.extrinsic
         rot1.exponential_map = rot2.exponential_map
         assert np.allclose(rot1.angles, rot2.angles)
+
+
+def test_rmat_cache():
+    """
+    Make sure the cached rmat follows changes to the angles and convention
+    """
+    np.random.seed(0)
+    for _ in range(100):
+        rot, scipy_rot = random_rot_mat_euler()
+        rmat = rot.rmat
+
+        # modifying the returned matrix must not touch the cached one
+        rmat[:] = 0
+        assert np.allclose(rot.rmat, scipy_rot.as_matrix())
+
+        # nor may modifying the angles in place go unnoticed
+        rot.angles[:] = 0
+        assert np.allclose(rot.rmat, np.eye(3))
+
+        rot.angles = np.random.rand(3)
+        rot.extrinsic = not rot.extrinsic
+        seq = rot.axes_order if rot.extrinsic else rot.axes_order.upper()
+        assert np.allclose(
+            rot.rmat,
+            R.from_euler(seq, rot.angles, rot.units == 'degrees').as_matrix()
+        )
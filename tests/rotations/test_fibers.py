@@ -0,0 +1,32 @@
+from hexrd import rotations
+import numpy as np
+
+
+def test_discrete_fiber():
+    """
+    Every orientation on the fiber takes c to s
+    """
+    np.random.seed(0)
+    for _ in range(20):
+        c, s = np.random.rand(2, 3) * 2 - 1
+        qfib = rotations.discreteFiber(c, s, ndiv=30)[0]
+        assert qfib.shape == (4, 30)
+        assert (qfib[0] >= 0).all()
+
+        rmats = rotations.rotMatOfQuat(qfib)
+        assert np.allclose(
+            np.dot(rmats, c / np.linalg.norm(c)),
+            s / np.linalg.norm(s)
+        )
+
+
+def test_discrete_fiber_antiparallel():
+    """
+    The fiber is still generated when c and s are antiparallel
+    """
+    c = np.array([1.0, 2.0, 3.0])
+    qfib = rotations.discreteFiber(c, -c, ndiv=12)[0]
+    assert qfib.shape == (4, 12)
+
+    c = c / np.linalg.norm(c)
+    assert np.allclose(np.dot(rotations.rotMatOfQuat(qfib), c), -c)
@@ -1,3 +1,5 @@
+import timeit
+
 from scipy.spatial.transform import Rotation as R
 
 import numpy as np
@@ -120,6 +122,41 @@ def test_invert_quat(num_quats):
             assert a.approx_equal(b)
 
 
+def test_invert_single_quat_timing():
+    """
+    Inverting a single quaternion is no slower than plain numpy
+    """
+    np.random.seed(0)
+    q = rand_quat().T
+
+    def invert_numpy():
+        qinv = q * np.c_[-1.0, 1, 1, 1].T
+        qinv /= np.linalg.norm(qinv, axis=0)
+        qinv[:, qinv[0] < 0] *= -1
+        return qinv
+
+    assert allclose(rotations.invertQuat(q), invert_numpy())
+    t_kernel = min(timeit.repeat(
+        lambda: rotations.invertQuat(q), number=1000, repeat=5
+    ))
+    t_numpy = min(timeit.repeat(invert_numpy, number=1000, repeat=5))
+    assert t_kernel < t_numpy
+
+
+def test_fix_and_invert_single_quat():
+    """
+    A single quaternion given as a 1-d array keeps its shape
+    """
+    q = np.array([-2.0, 0.0, 0.0, 2.0])
+    q_fix = rotations.fixQuat(q)
+    assert q_fix.shape == (4,)
+    assert np.allclose(q_fix, [np.sqrt(0.5), 0, 0, -np.sqrt(0.5)])
+
+    q_inv = rotations.invertQuat(q)
+    assert q_inv.shape == (4,)
+    assert np.allclose(q_inv, [np.sqrt(0.5), 0, 0, np.sqrt(0.5)])
+
+
 def test_quat_product_matrix(num_quats):
     """
     Ensure quatProductMatrix works
@@ -280,3 +317,11 @@ def pytest_generate_tests(metafunc):
     """
     if 'num_quats' in metafunc.fixturenames:
         metafunc.parametrize('num_quats', [1, 10])
+
+
+def test_quat_of_rot_mat_half_turn():
+    """
+    A half turn has a zero scalar part, which must survive the sign fix
+    """
+    quat = rotations.quatOfRotMat(np.diag([-1.0, -1.0, 1.0]))
+    assert allclose(quat, np.c_[0.0, 0.0, 0.0, 1.0].T)
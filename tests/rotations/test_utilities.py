@@ -1,5 +1,6 @@
 from hexrd import rotations
 import numpy as np
+import pytest
 
 
 def test_map_angle_degrees():
@@ -70,3 +71,35 @@ def test_map_angle_radians_range():
         assert (np.abs(map_angs_deg - min_val - np.pi) <= np.pi).all()
         assert np.allclose(np.sin(map_angs_deg), np.sin(angs))
         assert np.allclose(np.cos(map_angs_deg), np.cos(angs))
+
+
+def test_angular_difference_dtype():
+    """
+    Test that angularDifference keeps the floating point type of its input
+    """
+    np.random.seed(0)
+    for dtype in (np.float32, np.float64):
+        for units, period in (('degrees', 360), ('radians', 2 * np.pi)):
+            angs0 = (np.random.rand(10) * period).astype(dtype)
+            angs1 = (np.random.rand(10) * period).astype(dtype)
+            diff = rotations.angularDifference(angs0, angs1, units=units)
+            assert diff.dtype == dtype
+            expected = np.abs(angs1 - angs0)
+            expected = np.minimum(expected, period - expected)
+            assert np.allclose(diff, expected, atol=1e-4)
+
+
+def test_arccos_safe():
+    """
+    Test arccosSafe with round-off, out-of-range, NaN and bool input
+    """
+    assert np.allclose(rotations.arccosSafe([1.000001, -1.000001]), [0, np.pi])
+    assert np.allclose(rotations.arccosSafe(np.array([True, False])),
+                       [0, np.pi / 2])
+    for cosines in ([0.5, 1.1], [-1.1], [np.nan, 1.1]):
+        with pytest.raises(RuntimeError):
+            rotations.arccosSafe(cosines)
+
+    angs = rotations.arccosSafe([np.nan, 0.0])
+    assert np.isnan(angs[0])
+    assert np.isclose(angs[1], np.pi / 2)
@@ -24,3 +24,83 @@ def test_misorientations():
         assert np.allclose(ang, 0.0)
         assert np.allclose(mis[0, :], 1.)
         assert np.allclose(mis[1:, :], 0.)
+
+
+def test_misorientation_ties():
+    """Equally close symmetric equivalents give one quaternion per input"""
+    qsym = symmetry.quatOfLaueGroup("d4h")
+    q1 = np.c_[1.0, 0, 0, 0].T
+    q2 = rotations.quatOfAngleAxis(np.r_[np.pi / 4], np.c_[0.0, 0, 1].T)
+    ang, mis = rotations.misorientation(q1, q2, (qsym,))
+    assert np.allclose(ang, np.pi / 4)
+    assert mis.shape == (4, 1)
+
+
+def test_misorientation_nan():
+    """NaN quaternions give NaN misorientations"""
+    qsym = symmetry.quatOfLaueGroup("oh")
+    q1 = np.c_[1.0, 0, 0, 0].T
+    q2 = np.c_[np.nan, 0, 0, 0].T
+    ang, mis = rotations.misorientation(q1, q2, (qsym,))
+    assert np.all(np.isnan(ang))
+    assert np.all(np.isnan(mis))
+
+
+def test_quat_average():
+    """Averages of quaternions about a common axis"""
+    qsym = symmetry.quatOfLaueGroup("oh")
+    axis = np.c_[0.0, 0, 1].T
+    q_avg = rotations.quatOfAngleAxis(np.r_[0.3], axis)
+    for angles in ([0.2, 0.4], [0.2, 0.3, 0.4]):
+        q_in = rotations.quatOfAngleAxis(np.array(angles), axis)
+        for average in (rotations.quatAverage, rotations.quatAverageCluster):
+            q_bar = average(q_in, qsym)
+            assert q_bar.shape == (4, 1)
+            ang, _ = rotations.misorientation(q_avg, q_bar, (qsym,))
+            assert np.allclose(ang, 0.0)
+
+
+def test_to_fundamental_region():
+    """Representatives are the equivalents closest to the origin"""
+    np.random.seed(0)
+    q = np.random.normal(size=(4, 50))
+    q /= np.linalg.norm(q, axis=0)
+    for lg in ("ci", "d6h", "oh"):
+        qsym = symmetry.quatOfLaueGroup(lg)
+        qr = rotations.toFundamentalRegion(q, crysSym=lg)
+        assert qr.shape == q.shape
+        assert (qr[0] >= 0).all()
+
+        # same orientation as q, and no equivalent is closer to the origin
+        for j in range(q.shape[1]):
+            ang, _ = rotations.misorientation(
+                q[:, j:j + 1], qr[:, j:j + 1], (qsym,)
+            )
+            assert np.allclose(ang, 0.0, atol=1e-6)
+            qeqv = rotations.quatProduct(q[:, j:j + 1], qsym)
+            assert qr[0, j] >= np.abs(qeqv[0]).max() - 1e-12
+
+    # 3-d input keeps its shape
+    qr = rotations.toFundamentalRegion(q[:, :48].T.reshape(6, 8, 4)
+                                       .transpose(0, 2, 1))
+    assert qr.shape == (6, 4, 8)
+    assert np.allclose(qr.transpose(0, 2, 1).reshape(48, 4).T,
+                       rotations.toFundamentalRegion(q[:, :48]))
+
+
+def test_apply_sym():
+    """Count the distinct symmetric equivalents of vectors"""
+    qsym = symmetry.quatOfLaueGroup("oh")
+    for vec, counts in (
+        (np.c_[1.0, 2, 3].T, (24, 48, 24, 24)),
+        (np.c_[1.0, 0, 0].T, (6, 6, 3, 3)),
+        (np.c_[1.0, 1, 1].T, (8, 8, 4, 4)),
+    ):
+        for (cs, pm), count in zip(
+            [(False, False), (True, False), (False, True), (True, True)],
+            counts
+        ):
+            allhkl = rotations.applySym(vec, qsym, csFlag=cs, cullPM=pm)
+            assert allhkl.shape == (3, count)
+            assert np.allclose(np.linalg.norm(allhkl, axis=0),
+                               np.linalg.norm(vec))
@@ -0,0 +1,59 @@
+"""Test sampleOrientations module"""
+import numpy as np
+from numpy.testing import assert_allclose
+
+from hexrd import constants
+from hexrd.sampleOrientations import sampleRFZ
+from hexrd.sampleOrientations.conversions import (
+    ax2qu, ax2ro, cu2ho, cu2ro, ho2ax, ro2ax, ro2qu,
+)
+from hexrd.sampleOrientations.rfz import insideFZ
+
+# cu2ro and ro2qu skip the axis-angle intermediates, so they agree with
+# the chained conversions to within round-off only
+RTOL = 1e-10
+ATOL = 1e-14
+
+
+def _cu2ro_chained(cu):
+    return ax2ro(ho2ax(cu2ho(cu)))
+
+
+def _ro2qu_chained(ro):
+    return ax2qu(ro2ax(ro))
+
+
+def test_conversions_match_chained():
+    """Direct conversions agree with the axis-angle chains"""
+    rng = np.random.default_rng(0)
+    pts = (2 * rng.random((2000, 3)) - 1) * constants.cuA_2
+    # include the origin and points on the pyramid boundaries
+    pts = np.vstack([pts, np.zeros(3), np.eye(3) * 0.5, [0.3, 0.3, 0.3]])
+    for cu in pts:
+        ro = cu2ro(cu)
+        assert_allclose(ro, _cu2ro_chained(cu), rtol=RTOL, atol=ATOL)
+        assert_allclose(ro2qu(ro), _ro2qu_chained(ro), rtol=RTOL, atol=ATOL)
+
+
+def test_sample_rfz():
+    """sampleRFZ orientations agree with the chained conversions"""
+    spacing = 10.0
+    for pgnum in (1, 27, 32):
+        samples = sampleRFZ(pgnum, average_angular_spacing=spacing)
+
+        n = samples.cubN
+        grid = (np.arange(-n, n + 1) + samples.shift) * samples.delta
+        expected = []
+        for xx in grid:
+            for yy in grid:
+                for zz in grid:
+                    cu = np.array([xx, yy, zz])
+                    if np.max(np.abs(cu)) > samples.ap_2:
+                        continue
+                    ro = _cu2ro_chained(cu)
+                    if insideFZ(ro, pgnum):
+                        expected.append(_ro2qu_chained(ro))
+
+        assert_allclose(
+            samples.orientations, np.array(expected), rtol=RTOL, atol=ATOL
+        )